@@ -8,27 +8,107 @@ True headless streaming using direct frame capture methods:
 
 import os
 import sys
-import json
 import time
 import signal
 import logging
+import fcntl
 import asyncio
 import subprocess
 import threading
+import zlib
+import importlib.util
+from functools import lru_cache
 from pathlib import Path
-from io import BytesIO
 
+import orjson
 import requests
-from PIL import Image
 import numpy as np
 
+from streamer_kernels import rgb_to_i420
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# H.264 encoders in order of preference, with their low-latency settings (hardware
+# encoders negotiate their own input pixel format, so only x264 pins yuv420p)
+ENCODER_ARGS = {
+    'h264_nvenc': ('-c:v', 'h264_nvenc', '-preset', 'p1', '-tune', 'll', '-rc', 'cbr'),
+    'h264_qsv': ('-c:v', 'h264_qsv', '-preset', 'veryfast', '-low_power', '1'),
+    'h264_vaapi': ('-vaapi_device', '/dev/dri/renderD128', '-vf', 'format=nv12,hwupload', '-c:v', 'h264_vaapi'),
+    'h264_videotoolbox': ('-c:v', 'h264_videotoolbox', '-realtime', '1'),
+    'libx264': ('-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p'),
+}
+
+@lru_cache(maxsize=1)
+def detect_encoder():
+    """Pick the best H.264 encoder this FFmpeg build can actually open (probed once per process)"""
+    try:
+        listing = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                 stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.error(f"Could not list FFmpeg encoders: {e}")
+        return 'libx264'
+        
+    for encoder, args in ENCODER_ARGS.items():
+        if encoder == 'libx264' or f' {encoder} ' not in listing:
+            continue
+        # Being compiled in says nothing about the GPU/driver, so encode one tiny frame
+        try:
+            probe = subprocess.run(['ffmpeg', '-hide_banner', '-loglevel', 'error',
+                                    '-f', 'lavfi', '-i', 'color=size=256x144:duration=0.1',
+                                    *args, '-frames:v', '1', '-f', 'null', '-'],
+                                   stdin=subprocess.DEVNULL, capture_output=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            continue
+        if probe.returncode == 0:
+            logger.info(f"Using hardware encoder {encoder}")
+            return encoder
+    return 'libx264'
+
+def _drain_stderr(process, label):
+    """Log a child's stderr on a daemon thread so the pipe can never fill and block it"""
+    def drain():
+        for line in process.stderr:
+            logger.error(f"{label}: {line.decode(errors='replace').rstrip()}")
+    threading.Thread(target=drain, daemon=True).start()
+
+def _grow_pipe(fd, size=4 * 1024 * 1024):
+    """Enlarge a pipe's kernel buffer (64 KB default) so a whole frame fits without blocking"""
+    if not hasattr(fcntl, 'F_SETPIPE_SZ'):
+        return  # Linux only
+    try:
+        with open('/proc/sys/fs/pipe-max-size') as f:
+            size = min(size, int(f.read()))  # Unprivileged processes can't exceed this
+    except (OSError, ValueError):
+        pass
+    try:
+        fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, size)
+    except OSError as e:
+        logger.warning(f"Could not enlarge FFmpeg pipe to {size} bytes: {e}")
+
+def _writev_all(fd, buffers):
+    """Gather-write whole buffers to fd, resuming after short writes (pipes take them in chunks)"""
+    views = [memoryview(buf) for buf in buffers]
+    while views:
+        written = os.writev(fd, views)
+        # Drop the buffers that went out completely and trim the partial one
+        while views and written >= len(views[0]):
+            written -= len(views.pop(0))
+        if written:
+            views[0] = views[0][written:]
+
 class HeadlessHTMLStreamer:
     """True headless HTML streaming using Chrome DevTools Protocol"""
     
+    # Sent every frame, so encoded once
+    SCREENSHOT_CMD = orjson.dumps({
+        "id": 1,
+        "method": "Page.captureScreenshot",
+        "params": {"format": "png", "quality": 90}
+    })
+    JSON_HEADERS = {'Content-Type': 'application/json'}
+    
     def __init__(self, stream_key, content_path="https://example.com"):
         self.stream_key = stream_key
         self.content_path = content_path
@@ -36,6 +116,10 @@ class HeadlessHTMLStreamer:
         self.ffmpeg_process = None
         self.streaming = False
         self.debug_port = 9222
+        # One keep-alive connection to the DevTools endpoint instead of a new TCP
+        # connection for every 30fps screenshot request
+        self.session = requests.Session()
+        self.session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2))
         
     def start_chromium_headless(self):
         """Start Chromium in true headless mode with remote debugging"""
@@ -97,15 +181,24 @@ class HeadlessHTMLStreamer:
             stderr=subprocess.PIPE
         )
         
-        # Wait for Chrome to be ready
-        time.sleep(3)
+        # Wait for the DevTools endpoint rather than a fixed delay
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if self.chrome_process.poll() is not None:
+                return False
+            try:
+                self.session.get(f'http://127.0.0.1:{self.debug_port}/json/version', timeout=0.5)
+                return True
+            except requests.RequestException:
+                time.sleep(0.1)
+        logger.warning(f"Chromium debug port {self.debug_port} not responding after 10s")
         return self.chrome_process.poll() is None
         
     def get_chromium_tab_id(self):
         """Get the tab ID from Chromium DevTools API"""
         try:
-            response = requests.get(f'http://127.0.0.1:{self.debug_port}/json/list', timeout=5)
-            tabs = response.json()
+            response = self.session.get(f'http://127.0.0.1:{self.debug_port}/json/list', timeout=5)
+            tabs = orjson.loads(response.content)
             if tabs:
                 return tabs[0]['id']
         except Exception as e:
@@ -116,20 +209,16 @@ class HeadlessHTMLStreamer:
         """Capture screenshot using Chromium DevTools Protocol"""
         try:
             # Take screenshot via DevTools
-            screenshot_cmd = {
-                "id": 1,
-                "method": "Page.captureScreenshot",
-                "params": {"format": "png", "quality": 90}
-            }
-            
-            response = requests.post(
+            response = self.session.post(
                 f'http://127.0.0.1:{self.debug_port}/json/runtime/evaluate',
-                json=screenshot_cmd,
+                data=self.SCREENSHOT_CMD,
+                headers=self.JSON_HEADERS,
                 timeout=2
             )
             
             if response.status_code == 200:
-                result = response.json()
+                # orjson parses the multi-hundred-KB base64 payload far faster than json
+                result = orjson.loads(response.content)
                 if 'result' in result and 'data' in result['result']:
                     return result['result']['data']
         except Exception as e:
@@ -140,16 +229,15 @@ class HeadlessHTMLStreamer:
         """Start FFmpeg with stdin input for direct frame feeding"""
         ffmpeg_cmd = [
             'ffmpeg',
+            '-nostats', '-loglevel', 'error',  # Only errors on stderr (drained below)
             '-f', 'image2pipe',           # Input from pipe
             '-vcodec', 'png',             # Input codec
             '-framerate', '30',           # Input framerate
             '-i', '-',                    # Read from stdin
-            '-c:v', 'libx264',           # Output video codec
-            '-preset', 'veryfast',       # Encoding speed
+            *ENCODER_ARGS[detect_encoder()],  # Output video codec and speed settings
             '-b:v', '2500k',             # Video bitrate
             '-maxrate', '2500k',         # Max bitrate
             '-bufsize', '5000k',         # Buffer size
-            '-pix_fmt', 'yuv420p',       # Pixel format
             '-g', '60',                  # GOP size
             '-f', 'flv',                 # Output format
             f'rtmp://a.rtmp.youtube.com/live2/{self.stream_key}'
@@ -159,9 +247,11 @@ class HeadlessHTMLStreamer:
         self.ffmpeg_process = subprocess.Popen(
             ffmpeg_cmd,
             stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE
         )
+        _drain_stderr(self.ffmpeg_process, "FFmpeg")
+        _grow_pipe(self.ffmpeg_process.stdin.fileno())
         
         return self.ffmpeg_process.poll() is None
         
@@ -234,6 +324,7 @@ class HeadlessHTMLStreamer:
             except subprocess.TimeoutExpired:
                 self.chrome_process.kill()
                 
+        self.session.close()
         logger.info("Headless streaming stopped")
 
 
@@ -245,6 +336,25 @@ class HeadlessPygameStreamer:
         self.pygame_script = pygame_script
         self.ffmpeg_process = None
         self.streaming = False
+        self.stream_thread = None
+        self.write_thread = None
+        self.dropped_frames = 0
+        self._render_fn = None
+        self._err_font = None
+        self._err_cache = {}  # Rendered "Game Error" surfaces by message
+        self.width = 1280
+        self.height = 720
+        self.fps = 60
+        # Persistent row-major RGB24 frame, refilled in place for every capture
+        self._frame_buf = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._frame_view = memoryview(self._frame_buf).cast('B')
+        # Render -> pipe handoff: a single-producer/single-consumer ring of preallocated
+        # yuv420p slots (half the bytes of rgb24, and what the encoder wants anyway).
+        # empty/full semaphores count free and filled slots, so the bound is back-pressure
+        # (the head/tail indexes are locals of the two loops, each owning one)
+        self._ring = [np.empty(self.width * self.height * 3 // 2, dtype=np.uint8) for _ in range(4)]
+        self._slots_empty = threading.Semaphore(len(self._ring))
+        self._slots_full = threading.Semaphore(0)
         
     def start_pygame_headless(self):
         """Start Pygame in headless mode using dummy video driver"""
@@ -255,33 +365,159 @@ class HeadlessPygameStreamer:
         try:
             import pygame
             pygame.init()
-            pygame.display.set_mode((1280, 720))
+            pygame.display.set_mode((self.width, self.height))
             return True
         except Exception as e:
             logger.error(f"Failed to initialize headless Pygame: {e}")
             return False
             
     def capture_pygame_surface(self):
-        """Capture pygame surface as raw image data"""
+        """Capture pygame surface as a raw RGB24 frame (memoryview over a reused buffer)"""
         try:
             import pygame
             surface = pygame.display.get_surface()
             if surface:
-                # Convert surface to RGB array
-                rgb_array = pygame.surfarray.array3d(surface)
-                # Transpose for correct orientation
-                rgb_array = np.transpose(rgb_array, (1, 0, 2))
-                # Convert to PIL Image
-                image = Image.fromarray(rgb_array.astype('uint8'), 'RGB')
-                
-                # Convert to PNG bytes
-                img_bytes = BytesIO()
-                image.save(img_bytes, format='PNG')
-                return img_bytes.getvalue()
+                # pixels3d is a zero-copy (width, height, 3) view that locks the surface;
+                # swapaxes is another view, so the only copy is straight into _frame_buf
+                # (np.copyto releases the GIL for it, so the writer thread keeps running)
+                pixels = pygame.surfarray.pixels3d(surface)
+                try:
+                    np.copyto(self._frame_buf, pixels.swapaxes(0, 1))
+                finally:
+                    del pixels  # Release the surface lock
+                return self._frame_view
         except Exception as e:
             logger.error(f"Surface capture failed: {e}")
         return None
         
+    def load_game(self):
+        """Import the pygame script once and keep its render(surface) callable, if it has one"""
+        spec = importlib.util.spec_from_file_location('streamed_game', self.pygame_script)
+        game_module = importlib.util.module_from_spec(spec)
+        # Scripts without render() run their own loop here, exactly as before
+        spec.loader.exec_module(game_module)
+        render_fn = getattr(game_module, 'render', None)
+        if render_fn is not None and not callable(render_fn):
+            raise TypeError(f"{self.pygame_script}: render must be callable")
+        self._render_fn = render_fn
+        return render_fn is not None
+        
+    def render_error(self, screen, message):
+        """Show a game error on screen, rendering each distinct message only once"""
+        text = self._err_cache.get(message)
+        if text is None:
+            import pygame
+            if self._err_font is None:
+                self._err_font = pygame.font.Font(None, 36)
+            if len(self._err_cache) >= 32:
+                self._err_cache.clear()  # Keep messages that embed changing values bounded
+            text = self._err_font.render(f"Game Error: {message}", True, (255, 255, 255))
+            self._err_cache[message] = text
+            logger.error(f"Game render error: {message}")
+        screen.fill((0, 0, 0))
+        screen.blit(text, (10, 10))
+        
+    def stream_loop(self):
+        """Main streaming loop - renders and captures frames for the writer thread"""
+        import pygame
+        screen = pygame.display.get_surface()
+        
+        # Everything the loop touches is fixed once streaming starts, so bind it to locals
+        # up front instead of re-resolving attributes 30-60 times a second
+        render_fn = self._render_fn
+        capture = self.capture_pygame_surface
+        frame_buf = self._frame_buf
+        frame_view = self._frame_view
+        ring = self._ring
+        slots = len(ring)
+        take_slot = self._slots_empty.acquire
+        return_slot = self._slots_empty.release
+        publish = self._slots_full.release
+        ffmpeg_alive = self.ffmpeg_process.poll
+        monotonic = time.monotonic
+        sleep = time.sleep
+        fps = self.fps
+        
+        # Pace against absolute monotonic deadlines so timing error never accumulates
+        frame_period = 1.0 / fps
+        slot_wait = frame_period * 0.5
+        start = monotonic()
+        frame_index = 0
+        head = 0  # Next ring slot to fill
+        last_digest = None  # CRC of the last converted frame
+        
+        # The surface is captured on this thread between render() calls and only packed
+        # YUV crosses to the writer, so the screen is never read while being drawn. That
+        # makes a second (double-buffered) surface unnecessary, and it would hand render()
+        # a two-frames-old canvas, breaking scripts that draw incrementally
+        logger.info("Starting headless Pygame streaming loop...")
+        while self.streaming and ffmpeg_alive() is None:
+            try:
+                render_fn(screen)
+            except Exception as e:
+                self.render_error(screen, str(e))
+                
+            # Ring full means FFmpeg is lagging: drop this frame instead of stalling the loop,
+            # so a writer hiccup costs a frame rather than a latency spike
+            if not take_slot(timeout=slot_wait):
+                self.dropped_frames += 1
+            elif capture() is not None:
+                # rawvideo needs every frame written, but a static scene needn't be
+                # re-converted: copy the previous slot (only this loop writes slots)
+                digest = zlib.crc32(frame_view)
+                if digest == last_digest:
+                    np.copyto(ring[head % slots], ring[(head - 1) % slots])
+                else:
+                    # Convert straight into the writer's slot; no copy for the handoff
+                    rgb_to_i420(frame_buf, ring[head % slots])
+                    last_digest = digest
+                head += 1
+                publish()
+            else:
+                return_slot()
+                
+            frame_index += 1
+            delay = start + frame_index * frame_period - monotonic()
+            if delay > 0:
+                sleep(delay)
+            elif delay < -frame_period:
+                # Rendering ran long: skip the missed deadlines rather than racing to catch up
+                frame_index = int((monotonic() - start) * fps)
+            
+    def write_loop(self):
+        """Drain captured frames into FFmpeg's stdin so pipe stalls never block rendering"""
+        # Unbuffered stdin: frames go straight to the pipe with no per-frame flush
+        stdin_fd = self.ffmpeg_process.stdin.fileno()
+        frame_count = 0
+        log_every = self.fps * 10  # Log every 10 seconds
+        ring = self._ring
+        slots = len(ring)
+        take_frame = self._slots_full.acquire
+        free_slots = self._slots_empty.release
+        tail = 0  # Next ring slot to write
+        while True:
+            if not take_frame(timeout=0.5):
+                if not self.streaming:
+                    break  # Stopped and drained
+                continue
+            # If the writer fell behind, send every filled slot in one writev
+            ready = 1
+            while ready < slots and take_frame(blocking=False):
+                ready += 1
+                
+            try:
+                _writev_all(stdin_fd, [ring[i % slots] for i in range(tail, tail + ready)])
+            except (BrokenPipeError, OSError) as e:
+                logger.error(f"FFmpeg pipe closed: {e}")
+                self.streaming = False
+                break
+            tail += ready
+            free_slots(ready)
+            
+            previous, frame_count = frame_count, frame_count + ready
+            if frame_count // log_every > previous // log_every:
+                logger.info(f"Streamed {frame_count} frames (headless pygame)")
+            
     def start_streaming(self):
         """Start headless Pygame streaming"""
         if not self.start_pygame_headless():
@@ -290,16 +526,16 @@ class HeadlessPygameStreamer:
         # Start FFmpeg for direct frame input
         ffmpeg_cmd = [
             'ffmpeg',
-            '-f', 'image2pipe',
-            '-vcodec', 'png',
-            '-framerate', '60',
+            '-nostats', '-loglevel', 'error',
+            '-f', 'rawvideo',
+            '-pix_fmt', 'yuv420p',
+            '-video_size', f'{self.width}x{self.height}',
+            '-framerate', str(self.fps),
             '-i', '-',
-            '-c:v', 'libx264',
-            '-preset', 'veryfast',
+            *ENCODER_ARGS[detect_encoder()],
             '-b:v', '3000k',
             '-maxrate', '3000k',
             '-bufsize', '6000k',
-            '-pix_fmt', 'yuv420p',
             '-g', '120',
             '-f', 'flv',
             f'rtmp://a.rtmp.youtube.com/live2/{self.stream_key}'
@@ -308,17 +544,64 @@ class HeadlessPygameStreamer:
         self.ffmpeg_process = subprocess.Popen(
             ffmpeg_cmd,
             stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            bufsize=0
         )
+        _drain_stderr(self.ffmpeg_process, "FFmpeg")
+        # Frames still cross to FFmpeg over its stdin pipe: FFmpeg has no shared-memory
+        # rawvideo input, so an shm ring would need a relay process making the same copy
+        _grow_pipe(self.ffmpeg_process.stdin.fileno())
         
-        # Load and run the pygame script
-        if os.path.exists(self.pygame_script):
-            exec(open(self.pygame_script).read())
-            
         self.streaming = True
+        
+        # Load the pygame script; one exposing render(surface) is driven frame by frame
+        if os.path.exists(self.pygame_script):
+            try:
+                has_render = self.load_game()
+            except Exception as e:
+                logger.error(f"Failed to load {self.pygame_script}: {e}")
+                self.stop_streaming()
+                return False, f"Failed to load pygame script: {e}"
+                
+            if has_render:
+                self.write_thread = threading.Thread(target=self.write_loop, daemon=True)
+                self.write_thread.start()
+                self.stream_thread = threading.Thread(target=self.stream_loop, daemon=True)
+                self.stream_thread.start()
+                
         logger.info("Headless Pygame streaming started")
         return True, "Headless Pygame streaming started"
+        
+    def get_status(self):
+        """Get current streaming status"""
+        return {
+            "streaming": self.streaming,
+            "pygame_script": self.pygame_script,
+            "encoder": detect_encoder(),
+            "dropped_frames": self.dropped_frames
+        }
+        
+    def stop_streaming(self):
+        """Stop the frame loop and FFmpeg"""
+        self.streaming = False
+        
+        for thread in (self.stream_thread, self.write_thread):
+            if thread and thread is not threading.current_thread():
+                thread.join(timeout=5)
+            
+        if self.ffmpeg_process:
+            try:
+                self.ffmpeg_process.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+            self.ffmpeg_process.terminate()
+            try:
+                self.ffmpeg_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.ffmpeg_process.kill()
+                
+        logger.info("Headless Pygame streaming stopped")
 
 
 def main():
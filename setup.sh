@@ -395,7 +395,7 @@ Type=simple
 User=$CURRENT_USER
 WorkingDirectory=$CURRENT_DIR
 Environment=PATH=/usr/local/bin:/usr/bin:/bin
-ExecStart=$CURRENT_DIR/venv/bin/python $CURRENT_DIR/stream_manager.py
+ExecStart=$CURRENT_DIR/venv/bin/gunicorn --workers 1 --threads 8 --bind 0.0.0.0:5000 wsgi:app
 Restart=always
 RestartSec=10
 StandardOutput=journal
@@ -11,11 +11,19 @@ import sys
 import subprocess
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _probe(cmd):
+    """Run a capability probe; its stdout if the command succeeded, else None"""
+    try:
+        return subprocess.run(cmd, check=True, capture_output=True, text=True).stdout.strip()
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
 def detect_system_capabilities():
     """Detect what kind of system we're running on"""
     capabilities = {
@@ -33,34 +41,38 @@ def detect_system_capabilities():
     else:
         logger.info("🔌 Headless system detected (no display)")
     
+    # The tool probes are independent (browsers can take a second to print a version),
+    # so run them concurrently
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        xvfb, chromium, chrome, ffmpeg = pool.map(_probe, [
+            ['which', 'Xvfb'],
+            ['chromium-browser', '--version'],
+            ['google-chrome', '--version'],
+            ['ffmpeg', '-version']
+        ])
+    
     # Check for Xvfb
-    try:
-        subprocess.run(['which', 'Xvfb'], check=True, capture_output=True)
+    if xvfb is not None:
         capabilities['has_xvfb'] = True
         logger.info("✅ Xvfb available")
-    except subprocess.CalledProcessError:
+    else:
         logger.info("❌ Xvfb not available")
     
-    # Check for Chromium
-    try:
-        result = subprocess.run(['chromium-browser', '--version'], check=True, capture_output=True, text=True)
+    # Check for Chromium, falling back to Chrome
+    if chromium is not None:
         capabilities['has_chrome'] = True  # Keep same key for compatibility
-        logger.info(f"✅ Chromium available: {result.stdout.strip()}")
-    except subprocess.CalledProcessError:
-        # Fallback to Chrome if available
-        try:
-            result = subprocess.run(['google-chrome', '--version'], check=True, capture_output=True, text=True)
-            capabilities['has_chrome'] = True
-            logger.info(f"✅ Chrome available: {result.stdout.strip()}")
-        except subprocess.CalledProcessError:
-            logger.error("❌ Neither Chromium nor Chrome available")
+        logger.info(f"✅ Chromium available: {chromium}")
+    elif chrome is not None:
+        capabilities['has_chrome'] = True
+        logger.info(f"✅ Chrome available: {chrome}")
+    else:
+        logger.error("❌ Neither Chromium nor Chrome available")
     
     # Check for FFmpeg
-    try:
-        result = subprocess.run(['ffmpeg', '-version'], check=True, capture_output=True, text=True)
+    if ffmpeg is not None:
         capabilities['has_ffmpeg'] = True
         logger.info("✅ FFmpeg available")
-    except subprocess.CalledProcessError:
+    else:
         logger.error("❌ FFmpeg not available")
     
     # Determine recommended mode
@@ -6,18 +6,32 @@ Supports multiple concurrent streams with individual configurations
 
 import os
 import sys
+import hmac
+import asyncio
+import itertools
 import json
 import time
 import uuid
 import logging
 import signal
+import socket
 import sqlite3
 import subprocess
 from pathlib import Path
-from datetime import datetime, timedelta
+from types import SimpleNamespace, MappingProxyType
+
+import numpy as np
+import orjson
+import psutil
+from datetime import datetime, timedelta, timezone
+import threading
 from threading import Thread, Lock
-from functools import wraps
-from flask import Flask, render_template, request, jsonify, Response, session, redirect, url_for, flash
+from contextlib import ExitStack, contextmanager
+from functools import wraps, lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque
+from flask import Flask, render_template, request, Response, session, redirect, url_for, flash
+from flask.json.provider import JSONProvider
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
@@ -27,19 +41,184 @@ logger = logging.getLogger('stream-manager')
 # Global lock for thread-safe operations
 stream_lock = Lock()
 
+# Preset quality names, best first; _reduce_quality steps down this list
+QUALITY_LEVELS = ('ultra', 'high', 'medium', 'low')
+_QUALITY_INDEX = {name: i for i, name in enumerate(QUALITY_LEVELS)}
+
+# Numeric columns of stream_metrics, in table order
+METRIC_COLUMNS = ('fps', 'bitrate', 'frame_drops', 'cpu_usage', 'memory_usage',
+                  'bandwidth_mbps', 'viewers', 'duration_seconds')
+
+# Put each child in its own process group (pgid == pid) so cleanup can signal the whole
+# tree. process_group=0 is a plain setpgid() in the child and keeps CPython on its
+# vfork fast path; older interpreters fall back to a new session
+_SPAWN_GROUP = {'process_group': 0} if sys.version_info >= (3, 11) else {'start_new_session': True}
+
+# Placeholder track for streams without audio (ingests expect one). Silence needs no
+# stereo or bitrate; 44.1 kHz is kept because it is what the ingests recommend
+_SILENT_AUDIO_INPUT = ('-f', 'lavfi', '-i', 'anullsrc=channel_layout=mono:sample_rate=44100')
+_SILENT_AUDIO_CODEC = ('-c:a', 'aac', '-b:a', '32k')
+
+# Push each muxed packet to the ingest immediately instead of batching in the muxer
+_LOW_LATENCY_OUTPUT = ('-flush_packets', '1')
+
+@lru_cache(maxsize=32)
+def _compose_rtmp_url(base_url, stream_key):
+    """Join an ingest base URL and a stream key (memoized across restarts)"""
+    return f"{base_url}{stream_key}"
+
+def _parse_stat(value, default):
+    """Parse a numeric FFmpeg progress value, using default for missing or N/A"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+def _parse_json_field(value, default):
+    """Parse a JSON TEXT column, passing through already-parsed values"""
+    if value is None or value == '':
+        return default
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError as e:
+        logger.warning(f"Ignoring malformed JSON column value {value!r}: {e}")
+        return default
+
+@lru_cache(maxsize=64)
+def _quality_preset(resolution, bitrate, framerate):
+    """Read-only quality settings plus their numeric forms, parsed once per combination"""
+    width, height = map(int, resolution.split('x'))
+    return MappingProxyType({
+        'resolution': resolution, 'bitrate': bitrate, 'framerate': framerate,
+        'width': width, 'height': height, 'fps': int(framerate), 'bitrate_kbps': int(bitrate.rstrip('k')),
+    })
+
+@lru_cache(maxsize=64)
+def _x264_rate_args(bitrate, framerate):
+    """Rate-control argv for a bitrate/framerate (built once per quality, shared by every stream)"""
+    bitrate_kbps = int(bitrate.rstrip('k'))
+    return (
+        '-b:v', bitrate,
+        '-maxrate', bitrate,
+        '-bufsize', f"{bitrate_kbps * 2}k",
+        '-g', str(int(framerate) * 2)  # GOP size = 2 * framerate
+    )
+
+@lru_cache(maxsize=64)
+def _testsrc_argv(resolution, framerate, bitrate):
+    """FFmpeg argv for a lavfi test pattern at a quality, up to (not including) the output URL"""
+    return (
+        'ffmpeg',
+        '-f', 'lavfi',
+        '-i', f'testsrc=size={resolution}:rate={framerate}',
+        '-pix_fmt', 'yuv420p',
+        '-c:v', 'libx264',
+        '-preset', 'veryfast',
+        *_x264_rate_args(bitrate, framerate),
+        '-f', 'flv'
+    )
+
+@lru_cache(maxsize=64)
+def _compile_update(table, fields):
+    """UPDATE statement and bind order for a frozenset of columns (one SQL string per field combination)"""
+    field_order = tuple(sorted(fields))
+    assignments = ', '.join(f'{field} = ?' for field in field_order)
+    return f'UPDATE {table} SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?', field_order
+
+@lru_cache(maxsize=1)
+def _detect_headless_system_cached():
+    """Detect if we're running on a headless system (once per process)"""
+    try:
+        # Check if DISPLAY is set and accessible
+        display = os.environ.get('DISPLAY')
+        if not display:
+            return True
+        
+        # A local display without a server socket can't be up; skip the xset probe
+        host, _, number = display.partition(':')
+        if host in ('', 'unix') and not os.path.exists(f"/tmp/.X11-unix/X{number.split('.', 1)[0]}"):
+            return True
+        
+        # Try to connect to X server
+        result = subprocess.run(['xset', 'q'], capture_output=True, timeout=5)
+        if result.returncode == 0:
+            return False  # X11 available
+        
+        # Check if we're in a known headless environment
+        if os.path.exists('/usr/bin/chromium-browser') and not os.path.exists('/usr/bin/Xorg'):
+            return True
+            
+        # Default to headless if uncertain
+        return True
+        
+    except Exception:
+        # If detection fails, assume headless
+        return True
+
 class StreamDatabase:
     """SQLite database manager for stream configurations"""
     
+    # Columns update_stream writes (JSON ones are serialized there)
+    STREAM_UPDATE_FIELDS = ('name', 'title', 'description', 'quality', 'source', 'stream_key', 'rtmp_url',
+                            'custom_settings', 'audio_config', 'multi_stream_targets')
+    _STREAM_UPDATE_SET = frozenset(STREAM_UPDATE_FIELDS)
+    STREAM_JSON_FIELDS = frozenset(('custom_settings', 'audio_config', 'multi_stream_targets'))
+    
     def __init__(self, db_path="streams.db"):
         self.db_path = db_path
+        # One connection per thread: Flask handlers, the monitor and recovery workers don't share
+        self._local = threading.local()
+        # SQLite allows one writer at a time; in-process writers queue here instead of spinning on SQLITE_BUSY
+        self._write_lock = threading.Lock()
+        # Bumped on every write to the streams table; lets callers detect "nothing changed".
+        # Seeded from the clock so versions (and the ETags built on them) never repeat
+        # across process restarts
+        self.streams_version = time.time_ns()
+        self._versions = itertools.count(self.streams_version + 1)
         self.init_database()
     
+    def _bump_streams_version(self):
+        """Mark the streams table as changed"""
+        self.streams_version = next(self._versions)
+    
+    def _connect(self):
+        """This thread's connection (WAL mode), opened on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode = WAL')  # Readers never block the writer (or vice versa)
+            conn.execute('PRAGMA synchronous = NORMAL')
+            conn.execute('PRAGMA wal_autocheckpoint = 1000')
+            conn.execute('PRAGMA mmap_size = 268435456')
+            conn.execute('PRAGMA busy_timeout = 30000')
+            conn.execute('PRAGMA temp_store = MEMORY')  # Sorts/temp b-trees for ad-hoc queries stay off disk
+            self._local.conn = conn
+        elif conn.in_transaction:
+            conn.rollback()  # A previous call on this thread failed mid-transaction
+        return conn
+    
+    @contextmanager
+    def _writing(self):
+        """This thread's connection inside one write transaction, serialized across threads"""
+        with self._write_lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+    
     def init_database(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        # One script in one write transaction: a single round of locking/fsync at startup
+        with self._write_lock:
+            self._connect().executescript('''
+            BEGIN IMMEDIATE;
+            
             CREATE TABLE IF NOT EXISTS streams (
                 id TEXT PRIMARY KEY,
                 name TEXT NOT NULL,
@@ -63,10 +242,8 @@ class StreamDatabase:
                 uptime_seconds INTEGER DEFAULT 0,
                 start_time TIMESTAMP NULL,
                 FOREIGN KEY (project_id) REFERENCES projects (id)
-            )
-        ''')
-        
-        cursor.execute('''
+            );
+            
             CREATE TABLE IF NOT EXISTS stream_analytics (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 stream_id TEXT,
@@ -74,10 +251,8 @@ class StreamDatabase:
                 event_type TEXT,
                 data TEXT,
                 FOREIGN KEY (stream_id) REFERENCES streams (id)
-            )
-        ''')
-        
-        cursor.execute('''
+            );
+            
             CREATE TABLE IF NOT EXISTS stream_metrics (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 stream_id TEXT,
@@ -91,10 +266,8 @@ class StreamDatabase:
                 viewers INTEGER DEFAULT 0,
                 duration_seconds INTEGER DEFAULT 0,
                 FOREIGN KEY (stream_id) REFERENCES streams (id)
-            )
-        ''')
-        
-        cursor.execute('''
+            );
+            
             CREATE TABLE IF NOT EXISTS stream_alerts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 stream_id TEXT,
@@ -104,10 +277,8 @@ class StreamDatabase:
                 acknowledged BOOLEAN DEFAULT FALSE,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (stream_id) REFERENCES streams (id)
-            )
-        ''')
-        
-        cursor.execute('''
+            );
+            
             CREATE TABLE IF NOT EXISTS stream_recovery (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 stream_id TEXT,
@@ -121,10 +292,8 @@ class StreamDatabase:
                 failure_reason TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (stream_id) REFERENCES streams (id)
-            )
-        ''')
-        
-        cursor.execute('''
+            );
+            
             CREATE TABLE IF NOT EXISTS stream_health (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 stream_id TEXT,
@@ -134,10 +303,8 @@ class StreamDatabase:
                 stability_score REAL DEFAULT 100,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (stream_id) REFERENCES streams (id)
-            )
-        ''')
-        
-        cursor.execute('''
+            );
+            
             CREATE TABLE IF NOT EXISTS projects (
                 id TEXT PRIMARY KEY,
                 name TEXT NOT NULL,
@@ -147,10 +314,8 @@ class StreamDatabase:
                 schedule_config TEXT DEFAULT '{}',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
+            );
+            
             CREATE TABLE IF NOT EXISTS stream_templates (
                 id TEXT PRIMARY KEY,
                 name TEXT NOT NULL,
@@ -158,10 +323,8 @@ class StreamDatabase:
                 template_config TEXT NOT NULL,
                 category TEXT DEFAULT 'general',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
+            );
+            
             CREATE TABLE IF NOT EXISTS platform_configs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 platform_name TEXT NOT NULL,
@@ -171,48 +334,52 @@ class StreamDatabase:
                 max_bitrate INTEGER DEFAULT 6000,
                 recommended_settings TEXT DEFAULT '{}',
                 active BOOLEAN DEFAULT TRUE
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+            );
+            
+            CREATE INDEX IF NOT EXISTS idx_streams_created ON streams (created_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_streams_status ON streams (status);
+            CREATE INDEX IF NOT EXISTS idx_metrics_stream_time ON stream_metrics (stream_id, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_alerts_stream_ack ON stream_alerts (stream_id, acknowledged);
+            CREATE INDEX IF NOT EXISTS idx_health_stream_time ON stream_health (stream_id, timestamp);
+            
+            COMMIT;
+            ''')
         
         # Initialize platform configurations
         self.initialize_platform_configs()
     
     def create_stream(self, stream_data):
         """Create a new stream configuration"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        stream_id = str(uuid.uuid4())
-        cursor.execute('''
-            INSERT INTO streams (id, name, type, platform, stream_key, source, 
-                               quality, title, description, rtmp_url, custom_settings)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            stream_id,
-            stream_data['name'],
-            stream_data['type'],
-            stream_data['platform'],
-            stream_data['stream_key'],
-            stream_data['source'],
-            stream_data.get('quality', 'medium'),
-            stream_data.get('title', ''),
-            stream_data.get('description', ''),
-            stream_data.get('rtmp_url', ''),
-            json.dumps(stream_data.get('custom_settings', {}))
-        ))
-        
-        conn.commit()
-        conn.close()
+            stream_id = str(uuid.uuid4())
+            cursor.execute('''
+                INSERT INTO streams (id, name, type, platform, stream_key, source, 
+                                   quality, title, description, rtmp_url, custom_settings)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                stream_id,
+                stream_data['name'],
+                stream_data['type'],
+                stream_data['platform'],
+                stream_data['stream_key'],
+                stream_data['source'],
+                stream_data.get('quality', 'medium'),
+                stream_data.get('title', ''),
+                stream_data.get('description', ''),
+                stream_data.get('rtmp_url', ''),
+                json.dumps(stream_data.get('custom_settings', {}))
+            ))
+        
+        self._bump_streams_version()
         return stream_id
     
     def get_all_streams(self):
         """Get all stream configurations"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('SELECT * FROM streams ORDER BY created_at DESC')
         streams = []
@@ -228,19 +395,43 @@ class StreamDatabase:
                 stream['custom_settings'] = {}
             streams.append(stream)
         
-        conn.close()
+        return streams
+    
+    def get_all_streams_with_overrides(self, active):
+        """Get all streams with live {stream_id: (status, uptime)} overrides applied in SQL"""
+        cursor = self._connect().cursor()
+        cursor.row_factory = sqlite3.Row
+        
+        if active:
+            # Live rows ride in as a VALUES CTE; the leading status alias shadows s.status in sqlite3.Row lookups
+            live_rows = ', '.join(['(?, ?, ?)'] * len(active))
+            params = [value for stream_id, (status, uptime) in active.items() for value in (stream_id, status, uptime)]
+            cursor.execute(f'''
+                WITH live (id, status, uptime) AS (VALUES {live_rows})
+                SELECT COALESCE(live.status, s.status) AS status, COALESCE(live.uptime, '0m') AS uptime, s.*
+                FROM streams s LEFT JOIN live ON live.id = s.id
+                ORDER BY s.created_at DESC
+            ''', params)
+        else:
+            cursor.execute("SELECT status, '0m' AS uptime, * FROM streams ORDER BY created_at DESC")
+        
+        streams = []
+        for row in cursor:
+            stream = dict(row)
+            stream['custom_settings'] = _parse_json_field(stream['custom_settings'], {})
+            streams.append(stream)
+        
         return streams
     
     def get_stream(self, stream_id):
         """Get a specific stream configuration"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('SELECT * FROM streams WHERE id = ?', (stream_id,))
         row = cursor.fetchone()
         
-        conn.close()
         
         if not row:
             return None
@@ -259,165 +450,243 @@ class StreamDatabase:
     
     def update_stream_status(self, stream_id, status, start_time=None):
         """Update stream status"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        if status == 'live' and start_time:
-            cursor.execute('''
-                UPDATE streams 
-                SET status = ?, start_time = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (status, start_time, stream_id))
-        elif status == 'stopped':
-            # Calculate uptime when stopping
-            cursor.execute('SELECT start_time, uptime_seconds FROM streams WHERE id = ?', (stream_id,))
-            result = cursor.fetchone()
-            if result and result[0]:
-                start_time_db = datetime.fromisoformat(result[0])
-                session_uptime = (datetime.now() - start_time_db).total_seconds()
-                total_uptime = result[1] + session_uptime
-                
+            if status == 'live' and start_time:
                 cursor.execute('''
                     UPDATE streams 
-                    SET status = ?, start_time = NULL, uptime_seconds = ?, updated_at = CURRENT_TIMESTAMP
+                    SET status = ?, start_time = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
-                ''', (status, int(total_uptime), stream_id))
+                ''', (status, start_time, stream_id))
+            elif status == 'stopped':
+                # Calculate uptime when stopping
+                cursor.execute('SELECT start_time, uptime_seconds FROM streams WHERE id = ?', (stream_id,))
+                result = cursor.fetchone()
+                if result and result[0]:
+                    start_time_db = datetime.fromisoformat(result[0])
+                    session_uptime = (datetime.now() - start_time_db).total_seconds()
+                    total_uptime = result[1] + session_uptime
+                
+                    cursor.execute('''
+                        UPDATE streams 
+                        SET status = ?, start_time = NULL, uptime_seconds = ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (status, int(total_uptime), stream_id))
+                else:
+                    cursor.execute('''
+                        UPDATE streams 
+                        SET status = ?, start_time = NULL, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (status, stream_id))
             else:
                 cursor.execute('''
                     UPDATE streams 
-                    SET status = ?, start_time = NULL, updated_at = CURRENT_TIMESTAMP
+                    SET status = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                 ''', (status, stream_id))
-        else:
-            cursor.execute('''
-                UPDATE streams 
-                SET status = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (status, stream_id))
         
-        conn.commit()
-        conn.close()
+        self._bump_streams_version()
     
     def update_stream(self, stream_id, stream_data):
         """Update a stream configuration"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Build dynamic update query based on provided data
-        update_fields = []
-        values = []
-        
-        allowed_fields = ['name', 'title', 'description', 'quality', 'source', 'stream_key', 'rtmp_url']
-        
-        # Handle custom_settings as JSON
-        if 'custom_settings' in stream_data:
-            update_fields.append('custom_settings = ?')
-            values.append(json.dumps(stream_data['custom_settings']))
-        for field in allowed_fields:
-            if field in stream_data:
-                update_fields.append(f'{field} = ?')
-                values.append(stream_data[field])
-        
-        if not update_fields:
-            conn.close()
+        fields = self._STREAM_UPDATE_SET.intersection(stream_data)
+        if not fields:
             return False
         
-        # Add updated_at timestamp
-        update_fields.append('updated_at = CURRENT_TIMESTAMP')
+        query, field_order = _compile_update('streams', frozenset(fields))
+        # JSON columns are serialized once here; callers pass Python objects
+        values = [
+            json.dumps(stream_data[field]) if field in self.STREAM_JSON_FIELDS else stream_data[field]
+            for field in field_order
+        ]
         values.append(stream_id)
         
-        query = f'UPDATE streams SET {", ".join(update_fields)} WHERE id = ?'
-        cursor.execute(query, values)
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self._writing() as conn:
+            success = conn.execute(query, values).rowcount > 0
+        self._bump_streams_version()
         
         return success
     
+    def _update_targets(self, stream_id, expression, params, guard=''):
+        """Apply a JSON1 edit to multi_stream_targets in place; returns the new JSON text or None"""
+        with self._writing() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                UPDATE streams 
+                SET multi_stream_targets = {expression}, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? {guard}
+            ''', params)
+            if cursor.rowcount == 0:
+                return None
+            cursor.execute('SELECT multi_stream_targets FROM streams WHERE id = ?', (stream_id,))
+            targets_json = cursor.fetchone()[0]
+        
+        self._bump_streams_version()
+        return targets_json
+    
+    def append_multi_stream_target(self, stream_id, target):
+        """Append one multi-stream target without rewriting the list"""
+        return self._update_targets(
+            stream_id,
+            "json_insert(coalesce(nullif(multi_stream_targets, ''), '[]'), '$[#]', json(?))",
+            (json.dumps(target), stream_id)
+        )
+    
+    def remove_multi_stream_target(self, stream_id, index):
+        """Remove the multi-stream target at index; None if the stream or index doesn't exist"""
+        return self._update_targets(
+            stream_id,
+            "json_remove(multi_stream_targets, '$[' || ? || ']')",
+            (index, stream_id, index),
+            guard="AND ? < json_array_length(coalesce(nullif(multi_stream_targets, ''), '[]'))"
+        )
+    
     def delete_stream(self, stream_id):
         """Delete a stream configuration"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('DELETE FROM streams WHERE id = ?', (stream_id,))
-        cursor.execute('DELETE FROM stream_analytics WHERE stream_id = ?', (stream_id,))
+            cursor.execute('DELETE FROM streams WHERE id = ?', (stream_id,))
+            cursor.execute('DELETE FROM stream_analytics WHERE stream_id = ?', (stream_id,))
         
-        conn.commit()
-        conn.close()
+        self._bump_streams_version()
     
     def log_event(self, stream_id, event_type, data=None):
         """Log stream analytics event"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO stream_analytics (stream_id, event_type, data)
-            VALUES (?, ?, ?)
-        ''', (stream_id, event_type, json.dumps(data) if data else None))
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        conn.commit()
-        conn.close()
+            cursor.execute('''
+                INSERT INTO stream_analytics (stream_id, event_type, data)
+                VALUES (?, ?, ?)
+            ''', (stream_id, event_type, json.dumps(data) if data else None))
     
     def log_metrics(self, stream_id, metrics):
         """Log stream performance metrics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO stream_metrics 
-            (stream_id, fps, bitrate, frame_drops, cpu_usage, memory_usage, 
-             bandwidth_mbps, viewers, duration_seconds)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            stream_id,
-            metrics.get('fps', 0),
-            metrics.get('bitrate', 0),
-            metrics.get('frame_drops', 0),
-            metrics.get('cpu_usage', 0),
-            metrics.get('memory_usage', 0),
-            metrics.get('bandwidth_mbps', 0),
-            metrics.get('viewers', 0),
-            metrics.get('duration_seconds', 0)
-        ))
-        
-        conn.commit()
-        conn.close()
+            cursor.execute('''
+                INSERT INTO stream_metrics 
+                (stream_id, fps, bitrate, frame_drops, cpu_usage, memory_usage, 
+                 bandwidth_mbps, viewers, duration_seconds)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                stream_id,
+                metrics.get('fps', 0),
+                metrics.get('bitrate', 0),
+                metrics.get('frame_drops', 0),
+                metrics.get('cpu_usage', 0),
+                metrics.get('memory_usage', 0),
+                metrics.get('bandwidth_mbps', 0),
+                metrics.get('viewers', 0),
+                metrics.get('duration_seconds', 0)
+            ))
     
     def create_alert(self, stream_id, alert_type, severity, message):
         """Create a stream alert"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO stream_alerts (stream_id, alert_type, severity, message)
-            VALUES (?, ?, ?, ?)
-        ''', (stream_id, alert_type, severity, message))
+            cursor.execute('''
+                INSERT INTO stream_alerts (stream_id, alert_type, severity, message)
+                VALUES (?, ?, ?, ?)
+            ''', (stream_id, alert_type, severity, message))
+    
+    def apply_batch(self, ops):
+        """Apply queued (op, stream_id, *args) writes in a single transaction"""
+        rows = {'log_metrics': [], 'create_alert': [], 'log_event': [], 'update_stream_status': []}
+        for op, stream_id, *args in ops:
+            if op == 'log_metrics':
+                metrics = args[0]
+                rows[op].append((stream_id, *(metrics.get(column, 0) for column in METRIC_COLUMNS)))
+            elif op == 'create_alert':
+                rows[op].append((stream_id, *args))
+            elif op == 'log_event':
+                event_type, data = args
+                rows[op].append((stream_id, event_type, json.dumps(data) if data else None))
+            elif op == 'update_stream_status':
+                rows[op].append((args[0], stream_id))
+            else:
+                raise ValueError(f"Unknown batch op: {op}")
+        
+        with self._writing() as conn:
+            cursor = conn.cursor()
+            if rows['log_metrics']:
+                cursor.executemany('''
+                    INSERT INTO stream_metrics 
+                    (stream_id, fps, bitrate, frame_drops, cpu_usage, memory_usage, 
+                     bandwidth_mbps, viewers, duration_seconds)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows['log_metrics'])
+            if rows['create_alert']:
+                cursor.executemany('''
+                    INSERT INTO stream_alerts (stream_id, alert_type, severity, message)
+                    VALUES (?, ?, ?, ?)
+                ''', rows['create_alert'])
+            if rows['log_event']:
+                cursor.executemany('''
+                    INSERT INTO stream_analytics (stream_id, event_type, data)
+                    VALUES (?, ?, ?)
+                ''', rows['log_event'])
+            if rows['update_stream_status']:
+                cursor.executemany(
+                    'UPDATE streams SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                    rows['update_stream_status']
+                )
         
-        conn.commit()
-        conn.close()
+        if rows['update_stream_status']:
+            self._bump_streams_version()
     
     def get_recent_metrics(self, stream_id, minutes=30):
         """Get recent metrics for a stream"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        return list(self.iter_recent_metrics(stream_id, minutes))
+    
+    def iter_recent_metrics(self, stream_id, minutes=30):
+        """Recent metrics for a stream as a lazy iterator of row dicts, read off the cursor"""
+        cursor = self._connect().cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.arraysize = 500
         
         cursor.execute('''
             SELECT * FROM stream_metrics 
-            WHERE stream_id = ? AND timestamp > datetime('now', '-{} minutes')
+            WHERE stream_id = ? AND timestamp > datetime('now', ?)
             ORDER BY timestamp DESC
-        '''.format(minutes), (stream_id,))
+        ''', (stream_id, f'-{int(minutes)} minutes'))
         
-        metrics = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return metrics
+        return map(dict, cursor)
+    
+    def get_recent_metrics_columnar(self, stream_id, minutes=30):
+        """Get recent metrics for a stream as one numpy array per column"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.arraysize = 1000
+        
+        cursor.execute('''
+            SELECT timestamp, fps, bitrate, frame_drops, cpu_usage, memory_usage,
+                   bandwidth_mbps, viewers, duration_seconds
+            FROM stream_metrics 
+            WHERE stream_id = ? AND timestamp > datetime('now', ?)
+            ORDER BY timestamp DESC
+        ''', (stream_id, f'-{int(minutes)} minutes'))
+        
+        rows = cursor.fetchall()
+        
+        columns = {'timestamp': [r[0] for r in rows]}
+        for i, name in enumerate(METRIC_COLUMNS, start=1):
+            columns[name] = np.fromiter((r[i] for r in rows), dtype=np.float32, count=len(rows))
+        return columns
     
     def get_stream_alerts(self, stream_id=None, acknowledged=False):
         """Get stream alerts"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        return list(self.iter_stream_alerts(stream_id, acknowledged))
+    
+    def iter_stream_alerts(self, stream_id=None, acknowledged=False):
+        """Stream alerts as a lazy iterator of row dicts, read off the cursor"""
+        cursor = self._connect().cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.arraysize = 500
         
         if stream_id:
             cursor.execute('''
@@ -432,44 +701,38 @@ class StreamDatabase:
                 ORDER BY timestamp DESC
             ''', (acknowledged,))
         
-        alerts = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return alerts
+        return map(dict, cursor)
     
     def create_recovery_attempt(self, stream_id, failure_type, recovery_strategy, failure_reason=""):
         """Create a new recovery attempt record"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO stream_recovery (stream_id, failure_type, recovery_strategy, failure_reason)
-            VALUES (?, ?, ?, ?)
-        ''', (stream_id, failure_type, recovery_strategy, failure_reason))
+            cursor.execute('''
+                INSERT INTO stream_recovery (stream_id, failure_type, recovery_strategy, failure_reason)
+                VALUES (?, ?, ?, ?)
+            ''', (stream_id, failure_type, recovery_strategy, failure_reason))
+        
+            recovery_id = cursor.lastrowid
         
-        recovery_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
         return recovery_id
     
     def update_recovery_attempt(self, recovery_id, retry_count, success, recovery_duration=0):
         """Update a recovery attempt with results"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE stream_recovery 
-            SET retry_count = ?, success = ?, recovery_duration = ?, last_attempt = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (retry_count, success, recovery_duration, recovery_id))
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        conn.commit()
-        conn.close()
+            cursor.execute('''
+                UPDATE stream_recovery 
+                SET retry_count = ?, success = ?, recovery_duration = ?, last_attempt = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (retry_count, success, recovery_duration, recovery_id))
     
     def get_active_recovery(self, stream_id):
         """Get active recovery attempt for a stream"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('''
             SELECT * FROM stream_recovery 
@@ -478,27 +741,31 @@ class StreamDatabase:
         ''', (stream_id,))
         
         recovery = cursor.fetchone()
-        conn.close()
         return dict(recovery) if recovery else None
     
     def log_health_score(self, stream_id, health_score, connection_quality=100, performance_score=100, stability_score=100):
         """Log stream health metrics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO stream_health (stream_id, health_score, connection_quality, performance_score, stability_score)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (stream_id, health_score, connection_quality, performance_score, stability_score))
-        
-        conn.commit()
-        conn.close()
+            cursor.execute('''
+                INSERT INTO stream_health (stream_id, health_score, connection_quality, performance_score, stability_score)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (stream_id, health_score, connection_quality, performance_score, stability_score))
+    
+    def log_health_scores_batch(self, rows):
+        """Log buffered health rows (stream_id, health, connection, performance, stability, timestamp) in one transaction"""
+        with self._writing() as conn:
+            conn.executemany('''
+                INSERT INTO stream_health (stream_id, health_score, connection_quality, performance_score, stability_score, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
     
     def get_latest_health(self, stream_id):
         """Get latest health score for a stream"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('''
             SELECT * FROM stream_health 
@@ -507,14 +774,29 @@ class StreamDatabase:
         ''', (stream_id,))
         
         health = cursor.fetchone()
-        conn.close()
         return dict(health) if health else None
     
+    def get_overview(self, live_ids=()):
+        """Dashboard totals in one aggregate query; rows in live_ids are counted by the caller"""
+        cursor = self._connect().cursor()
+        cursor.row_factory = sqlite3.Row
+        
+        cursor.execute('''
+            SELECT 
+                COUNT(*) as total_streams,
+                COALESCE(SUM(status = 'live' AND id NOT IN (SELECT value FROM json_each(?))), 0) as live_streams,
+                COALESCE(SUM(uptime_seconds), 0) as uptime_seconds,
+                (SELECT COUNT(*) FROM stream_alerts WHERE acknowledged = 0) as active_alerts
+            FROM streams
+        ''', (orjson.dumps(list(live_ids)).decode(),))
+        
+        return dict(cursor.fetchone())
+    
     def get_recovery_stats(self, stream_id=None):
         """Get recovery statistics"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         if stream_id:
             cursor.execute('''
@@ -537,36 +819,33 @@ class StreamDatabase:
             ''')
         
         stats = cursor.fetchone()
-        conn.close()
         return dict(stats) if stats else {}
     
     def create_project(self, project_data):
         """Create a new project"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
+        
+            project_id = str(uuid.uuid4())
+            cursor.execute('''
+                INSERT INTO projects (id, name, description, settings, audio_config, schedule_config)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                project_id,
+                project_data['name'],
+                project_data.get('description', ''),
+                json.dumps(project_data.get('settings', {})),
+                json.dumps(project_data.get('audio_config', {})),
+                json.dumps(project_data.get('schedule_config', {}))
+            ))
         
-        project_id = str(uuid.uuid4())
-        cursor.execute('''
-            INSERT INTO projects (id, name, description, settings, audio_config, schedule_config)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            project_id,
-            project_data['name'],
-            project_data.get('description', ''),
-            json.dumps(project_data.get('settings', {})),
-            json.dumps(project_data.get('audio_config', {})),
-            json.dumps(project_data.get('schedule_config', {}))
-        ))
-        
-        conn.commit()
-        conn.close()
         return project_id
     
     def get_all_projects(self):
         """Get all projects"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('SELECT * FROM projects ORDER BY name')
         projects = []
@@ -583,19 +862,17 @@ class StreamDatabase:
                     project[field] = {}
             projects.append(project)
         
-        conn.close()
         return projects
     
     def get_project(self, project_id):
         """Get a specific project"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('SELECT * FROM projects WHERE id = ?', (project_id,))
         row = cursor.fetchone()
         
-        conn.close()
         
         if not row:
             return None
@@ -615,9 +892,6 @@ class StreamDatabase:
     
     def update_project(self, project_id, project_data):
         """Update a project"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         update_fields = []
         values = []
         
@@ -634,60 +908,53 @@ class StreamDatabase:
                 values.append(json.dumps(project_data[field]))
         
         if not update_fields:
-            conn.close()
             return False
         
         update_fields.append('updated_at = CURRENT_TIMESTAMP')
         values.append(project_id)
         
         query = f'UPDATE projects SET {", ".join(update_fields)} WHERE id = ?'
-        cursor.execute(query, values)
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self._writing() as conn:
+            success = conn.execute(query, values).rowcount > 0
         return success
     
     def delete_project(self, project_id):
         """Delete a project and update associated streams"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
         
-        # Update streams to remove project association
-        cursor.execute('UPDATE streams SET project_id = NULL WHERE project_id = ?', (project_id,))
+            # Update streams to remove project association
+            cursor.execute('UPDATE streams SET project_id = NULL WHERE project_id = ?', (project_id,))
         
-        # Delete project
-        cursor.execute('DELETE FROM projects WHERE id = ?', (project_id,))
+            # Delete project
+            cursor.execute('DELETE FROM projects WHERE id = ?', (project_id,))
         
-        conn.commit()
-        conn.close()
+        self._bump_streams_version()
     
     def create_template(self, template_data):
         """Create a stream template"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._writing() as conn:
+            cursor = conn.cursor()
+        
+            template_id = str(uuid.uuid4())
+            cursor.execute('''
+                INSERT INTO stream_templates (id, name, description, template_config, category)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (
+                template_id,
+                template_data['name'],
+                template_data.get('description', ''),
+                json.dumps(template_data['template_config']),
+                template_data.get('category', 'general')
+            ))
         
-        template_id = str(uuid.uuid4())
-        cursor.execute('''
-            INSERT INTO stream_templates (id, name, description, template_config, category)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
-            template_id,
-            template_data['name'],
-            template_data.get('description', ''),
-            json.dumps(template_data['template_config']),
-            template_data.get('category', 'general')
-        ))
-        
-        conn.commit()
-        conn.close()
         return template_id
     
     def get_all_templates(self):
         """Get all stream templates"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('SELECT * FROM stream_templates ORDER BY category, name')
         templates = []
@@ -703,118 +970,113 @@ class StreamDatabase:
                 template['template_config'] = {}
             templates.append(template)
         
-        conn.close()
         return templates
     
     def initialize_platform_configs(self):
         """Initialize default platform configurations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if platforms are already initialized
-        cursor.execute('SELECT COUNT(*) FROM platform_configs')
-        if cursor.fetchone()[0] > 0:
-            conn.close()
-            return
-        
-        # Default platform configurations
-        platforms = [
-            {
-                'platform_name': 'youtube',
-                'display_name': 'YouTube Live',
-                'rtmp_url': 'rtmp://a.rtmp.youtube.com/live2/',
-                'supports_auth': True,
-                'max_bitrate': 9000,
-                'recommended_settings': json.dumps({
-                    'resolution': '1920x1080',
-                    'framerate': 60,
-                    'keyframe_interval': 2
-                })
-            },
-            {
-                'platform_name': 'twitch',
-                'display_name': 'Twitch',
-                'rtmp_url': 'rtmp://live.twitch.tv/live/',
-                'supports_auth': True,
-                'max_bitrate': 6000,
-                'recommended_settings': json.dumps({
-                    'resolution': '1920x1080',
-                    'framerate': 60,
-                    'keyframe_interval': 2
-                })
-            },
-            {
-                'platform_name': 'facebook',
-                'display_name': 'Facebook Live',
-                'rtmp_url': 'rtmps://live-api-s.facebook.com:443/rtmp/',
-                'supports_auth': True,
-                'max_bitrate': 4000,
-                'recommended_settings': json.dumps({
-                    'resolution': '1280x720',
-                    'framerate': 30,
-                    'keyframe_interval': 2
-                })
-            },
-            {
-                'platform_name': 'linkedin',
-                'display_name': 'LinkedIn Live',
-                'rtmp_url': 'rtmps://1-46c2-477-4480.live-video.net/live/',
-                'supports_auth': True,
-                'max_bitrate': 5000,
-                'recommended_settings': json.dumps({
-                    'resolution': '1920x1080',
-                    'framerate': 30,
-                    'keyframe_interval': 2
-                })
-            },
-            {
-                'platform_name': 'instagram',
-                'display_name': 'Instagram Live',
-                'rtmp_url': 'rtmps://live-upload.instagram.com/rtmp/',
-                'supports_auth': True,
-                'max_bitrate': 3500,
-                'recommended_settings': json.dumps({
-                    'resolution': '1080x1920',
-                    'framerate': 30,
-                    'keyframe_interval': 2
-                })
-            },
-            {
-                'platform_name': 'tiktok',
-                'display_name': 'TikTok Live',
-                'rtmp_url': 'rtmp://push.tiktokcdn.com/live/',
-                'supports_auth': True,
-                'max_bitrate': 4000,
-                'recommended_settings': json.dumps({
-                    'resolution': '1080x1920',
-                    'framerate': 30,
-                    'keyframe_interval': 2
-                })
-            }
-        ]
-        
-        for platform in platforms:
-            cursor.execute('''
-                INSERT INTO platform_configs 
-                (platform_name, display_name, rtmp_url, supports_auth, max_bitrate, recommended_settings)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                platform['platform_name'],
-                platform['display_name'],
-                platform['rtmp_url'],
-                platform['supports_auth'],
-                platform['max_bitrate'],
-                platform['recommended_settings']
-            ))
+        with self._writing() as conn:
+            cursor = conn.cursor()
+        
+            # Check if platforms are already initialized
+            cursor.execute('SELECT COUNT(*) FROM platform_configs')
+            if cursor.fetchone()[0] > 0:
+                return
+        
+            # Default platform configurations
+            platforms = [
+                {
+                    'platform_name': 'youtube',
+                    'display_name': 'YouTube Live',
+                    'rtmp_url': 'rtmp://a.rtmp.youtube.com/live2/',
+                    'supports_auth': True,
+                    'max_bitrate': 9000,
+                    'recommended_settings': json.dumps({
+                        'resolution': '1920x1080',
+                        'framerate': 60,
+                        'keyframe_interval': 2
+                    })
+                },
+                {
+                    'platform_name': 'twitch',
+                    'display_name': 'Twitch',
+                    'rtmp_url': 'rtmp://live.twitch.tv/live/',
+                    'supports_auth': True,
+                    'max_bitrate': 6000,
+                    'recommended_settings': json.dumps({
+                        'resolution': '1920x1080',
+                        'framerate': 60,
+                        'keyframe_interval': 2
+                    })
+                },
+                {
+                    'platform_name': 'facebook',
+                    'display_name': 'Facebook Live',
+                    'rtmp_url': 'rtmps://live-api-s.facebook.com:443/rtmp/',
+                    'supports_auth': True,
+                    'max_bitrate': 4000,
+                    'recommended_settings': json.dumps({
+                        'resolution': '1280x720',
+                        'framerate': 30,
+                        'keyframe_interval': 2
+                    })
+                },
+                {
+                    'platform_name': 'linkedin',
+                    'display_name': 'LinkedIn Live',
+                    'rtmp_url': 'rtmps://1-46c2-477-4480.live-video.net/live/',
+                    'supports_auth': True,
+                    'max_bitrate': 5000,
+                    'recommended_settings': json.dumps({
+                        'resolution': '1920x1080',
+                        'framerate': 30,
+                        'keyframe_interval': 2
+                    })
+                },
+                {
+                    'platform_name': 'instagram',
+                    'display_name': 'Instagram Live',
+                    'rtmp_url': 'rtmps://live-upload.instagram.com/rtmp/',
+                    'supports_auth': True,
+                    'max_bitrate': 3500,
+                    'recommended_settings': json.dumps({
+                        'resolution': '1080x1920',
+                        'framerate': 30,
+                        'keyframe_interval': 2
+                    })
+                },
+                {
+                    'platform_name': 'tiktok',
+                    'display_name': 'TikTok Live',
+                    'rtmp_url': 'rtmp://push.tiktokcdn.com/live/',
+                    'supports_auth': True,
+                    'max_bitrate': 4000,
+                    'recommended_settings': json.dumps({
+                        'resolution': '1080x1920',
+                        'framerate': 30,
+                        'keyframe_interval': 2
+                    })
+                }
+            ]
         
-        conn.commit()
-        conn.close()
+            for platform in platforms:
+                cursor.execute('''
+                    INSERT INTO platform_configs 
+                    (platform_name, display_name, rtmp_url, supports_auth, max_bitrate, recommended_settings)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (
+                    platform['platform_name'],
+                    platform['display_name'],
+                    platform['rtmp_url'],
+                    platform['supports_auth'],
+                    platform['max_bitrate'],
+                    platform['recommended_settings']
+                ))
     
     def get_platform_configs(self):
         """Get all platform configurations"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         
         cursor.execute('SELECT * FROM platform_configs WHERE active = 1 ORDER BY display_name')
         platforms = []
@@ -830,18 +1092,68 @@ class StreamDatabase:
                 platform['recommended_settings'] = {}
             platforms.append(platform)
         
-        conn.close()
         return platforms
 
 class StreamInstance:
     """Individual stream instance with process management"""
     
+    # One instance per stream; slots keep them small and attribute reads cheap.
+    # New instance attributes must be added here.
+    __slots__ = (
+        'config', 'db', 'processes', 'status', 'metrics', '_metrics_lock', '_metrics_time',
+        'lifecycle_lock', '_metrics_dirty', '_metrics_signature', '_last_collected',
+        'last_metrics_time', 'frame_count', 'start_time', 'health_score', 'failure_count',
+        'last_recovery_attempt', 'recovery_in_progress', 'active_recovery_id',
+        'platform_configs', '_rtmp_url_templates', '_audio', '_targets',
+        '_psutil_handles', '_base_env', '_headless_pygame_env', '_live_stats', '_progress_time',
+        '_bitrate_kbps', '_framerate', '_rate_args',
+        '_ffmpeg_argv_template', '_ffmpeg_env', '_ffmpeg_builder', '_health_buffer', '_last_health_flush',
+        '_display', '_display_env', '_quality', '_quality_idx', 'process_watcher', 'ffmpeg_threads'
+    )
+    
+    # Config fields that need a full restart vs. just an FFmpeg restart (see reconfigure)
+    RENDERER_FIELDS = frozenset({'type', 'source', 'platform', 'orientation'})
+    FFMPEG_FIELDS = frozenset({'quality', 'custom_settings', 'stream_key', 'rtmp_url',
+                               'audio_config', 'multi_stream_targets'})
+    
+    # Quality settings (horizontal presets); read-only and shared by every instance
+    quality_presets = MappingProxyType({
+        'low': _quality_preset('854x480', '1000k', '24'),
+        'medium': _quality_preset('1280x720', '2500k', '30'),
+        'high': _quality_preset('1920x1080', '4000k', '30'),
+        'ultra': _quality_preset('1920x1080', '6000k', '60')
+    })
+    
+    # Vertical quality presets for mobile platforms
+    vertical_quality_presets = MappingProxyType({
+        'low': _quality_preset('480x854', '1000k', '24'),
+        'medium': _quality_preset('720x1280', '2500k', '30'),
+        'high': _quality_preset('1080x1920', '4000k', '30'),
+        'ultra': _quality_preset('1080x1920', '6000k', '60')
+    })
+    
+    # Platforms that prefer vertical orientation
+    vertical_platforms = frozenset({'tiktok', 'instagram'})
+    
+    # Platform configs loaded once from the DB and shared read-only by every instance
+    _shared_platform_configs = None
+    _shared_rtmp_url_templates = None
+    
     def __init__(self, stream_config, db):
         self.config = stream_config
         self.db = db
         self.processes = {}
         self.status = "stopped"
         self.metrics = {}
+        self._metrics_lock = Lock()
+        # Serializes start/stop/recovery of this stream; taken after stream_lock, never before
+        self.lifecycle_lock = Lock()
+        self._metrics_time = 0.0
+        # Set when a sample moves materially (or the stream restarts); the monitor only
+        # scores and records metrics for dirty streams, plus a periodic heartbeat
+        self._metrics_dirty = True
+        self._metrics_signature = None
+        self._last_collected = 0.0
         self.last_metrics_time = time.time()
         self.frame_count = 0
         self.start_time = None
@@ -850,50 +1162,123 @@ class StreamInstance:
         self.last_recovery_attempt = 0
         self.recovery_in_progress = False
         self.active_recovery_id = None
-        
-        # Quality settings (horizontal presets)
-        self.quality_presets = {
-            'low': {'resolution': '854x480', 'bitrate': '1000k', 'framerate': '24'},
-            'medium': {'resolution': '1280x720', 'bitrate': '2500k', 'framerate': '30'},
-            'high': {'resolution': '1920x1080', 'bitrate': '4000k', 'framerate': '30'},
-            'ultra': {'resolution': '1920x1080', 'bitrate': '6000k', 'framerate': '60'}
-        }
-        
-        # Vertical quality presets for mobile platforms
-        self.vertical_quality_presets = {
-            'low': {'resolution': '480x854', 'bitrate': '1000k', 'framerate': '24'},
-            'medium': {'resolution': '720x1280', 'bitrate': '2500k', 'framerate': '30'},
-            'high': {'resolution': '1080x1920', 'bitrate': '4000k', 'framerate': '30'},
-            'ultra': {'resolution': '1080x1920', 'bitrate': '6000k', 'framerate': '60'}
-        }
-        
-        # Platforms that prefer vertical orientation
-        self.vertical_platforms = {'tiktok', 'instagram'}
+        self._psutil_handles = {}
+        self._bitrate_kbps = 0
+        self._framerate = 0
+        self._rate_args = ()
+        self._live_stats = {}
+        self._progress_time = 0.0  # monotonic time of FFmpeg's last progress report
+        self._ffmpeg_argv_template = None
+        self._ffmpeg_env = None
+        self._ffmpeg_builder = None  # builder(quality) for the launch path that started FFmpeg
+        self._health_buffer = deque(maxlen=128)
+        self._last_health_flush = time.time()
+        self.process_watcher = None  # Set by StreamManager: called as watcher(instance, name, proc)
+        self.ffmpeg_threads = None  # Encoder thread budget, set by StreamManager
+        
+        # Spawn environments, snapshotted once instead of copied per launch
+        self._base_env = os.environ.copy()
+        self._headless_pygame_env = {**self._base_env, 'SDL_VIDEODRIVER': 'dummy', 'SDL_AUDIODRIVER': 'dummy'}
+        
+        # Virtual display and effective quality are fixed per stream; resolve them once
+        self._display = f":9{self.config['id'][-1]}"
+        self._display_env = {**self._base_env, 'DISPLAY': self._display}
+        self._quality = self._resolve_quality()
+        self._quality_idx = _QUALITY_INDEX.get(self.config.get('quality', 'medium'))  # None for custom
         
         # Load platform configurations from database
-        self.platform_configs = {}
         self._load_platform_configs()
         
-        # Audio configuration
-        self.audio_config = self.config.get('audio_config', {})
-        self.multi_stream_targets = self.config.get('multi_stream_targets', [])
+        # Audio configuration and multi-stream targets, parsed from config on first use
+        self._audio = None
+        self._targets = None
+    
+    @property
+    def audio_config(self):
+        """Parsed audio_config (memoized)"""
+        if self._audio is None:
+            self._audio = _parse_json_field(self.config.get('audio_config'), {})
+        return self._audio
+    
+    @audio_config.setter
+    def audio_config(self, value):
+        self._audio = value
+    
+    @property
+    def multi_stream_targets(self):
+        """Parsed multi_stream_targets list (memoized)"""
+        if self._targets is None:
+            self._targets = _parse_json_field(self.config.get('multi_stream_targets'), [])
+        return self._targets
+    
+    @multi_stream_targets.setter
+    def multi_stream_targets(self, value):
+        self._targets = value
     
     def _load_platform_configs(self):
-        """Load platform configurations from database"""
+        """Load platform configurations from database (shared across instances)"""
+        cls = type(self)
+        if cls._shared_platform_configs is not None:
+            self.platform_configs = cls._shared_platform_configs
+            self._rtmp_url_templates = cls._shared_rtmp_url_templates
+            return
+        
         try:
             platforms = self.db.get_platform_configs()
-            for platform in platforms:
-                self.platform_configs[platform['platform_name']] = platform
+            self.platform_configs = {p['platform_name']: p for p in platforms}
         except Exception as e:
-            logger.error(f"Failed to load platform configs: {e}")
-            # Fallback to basic configs
+            logger.error(f"Error loading platform configs: {e}")
+            # Fallback to hardcoded configs (not shared, so the next instance retries the DB)
             self.platform_configs = {
-                'youtube': {'rtmp_url': 'rtmp://a.rtmp.youtube.com/live2/'},
-                'twitch': {'rtmp_url': 'rtmp://live.twitch.tv/live/'},
-                'facebook': {'rtmp_url': 'rtmps://live-api-s.facebook.com:443/rtmp/'},
-                'tiktok': {'rtmp_url': 'rtmp://push.tiktokcdn.com/live/'},
-                'instagram': {'rtmp_url': 'rtmps://live-upload.instagram.com/rtmp/'}
+                'youtube': {'rtmp_url': 'rtmp://a.rtmp.youtube.com/live2/', 'max_bitrate': 9000},
+                'twitch': {'rtmp_url': 'rtmp://live.twitch.tv/live/', 'max_bitrate': 6000},
+                'facebook': {'rtmp_url': 'rtmps://live-api-s.facebook.com:443/rtmp/', 'max_bitrate': 4000},
+                'tiktok': {'rtmp_url': 'rtmp://push.tiktokcdn.com/live/', 'max_bitrate': 4000},
+                'instagram': {'rtmp_url': 'rtmps://live-upload.instagram.com/rtmp/', 'max_bitrate': 3500}
             }
+            self._rtmp_url_templates = {name: cfg['rtmp_url'] for name, cfg in self.platform_configs.items()}
+            return
+        
+        # Ingest base URL per platform, used by _build_rtmp_url
+        self._rtmp_url_templates = {name: cfg['rtmp_url'] for name, cfg in self.platform_configs.items()}
+        cls._shared_platform_configs = self.platform_configs
+        cls._shared_rtmp_url_templates = self._rtmp_url_templates
+    
+    @classmethod
+    def invalidate_platform_configs(cls):
+        """Drop the shared platform configs so the next instance reloads them"""
+        cls._shared_platform_configs = None
+        cls._shared_rtmp_url_templates = None
+    
+    def _resolve_quality(self):
+        """Resolve the effective quality settings (custom, or preset by orientation)"""
+        # Handle custom quality settings
+        if self.config.get('quality') == 'custom' and 'custom_settings' in self.config:
+            custom = self.config['custom_settings']
+            quality = _quality_preset(
+                custom.get('resolution', '1280x720'),
+                f"{custom.get('bitrate', '2500')}k",
+                str(custom.get('framerate', '30'))
+            )
+        else:
+            # Choose quality preset based on orientation preference
+            orientation = self.config.get('orientation', 'auto')
+            platform = self.config.get('platform', '')
+            
+            # Determine effective orientation
+            if orientation == 'auto':
+                use_vertical = platform in self.vertical_platforms
+            elif orientation == 'vertical':
+                use_vertical = True
+            else:  # horizontal
+                use_vertical = False
+            
+            if use_vertical:
+                quality = self.vertical_quality_presets.get(self.config.get('quality', 'medium'))
+            else:
+                quality = self.quality_presets.get(self.config.get('quality', 'medium'))
+        
+        return quality
     
     def start_streaming(self):
         """Start the streaming process"""
@@ -901,37 +1286,15 @@ class StreamInstance:
             return False, "Stream is already running"
         
         try:
-            # Handle custom quality settings
-            if self.config.get('quality') == 'custom' and 'custom_settings' in self.config:
-                custom = self.config['custom_settings']
-                quality = {
-                    'resolution': custom.get('resolution', '1280x720'),
-                    'bitrate': custom.get('bitrate', '2500') + 'k',
-                    'framerate': custom.get('framerate', '30')
-                }
-            else:
-                # Choose quality preset based on orientation preference
-                orientation = self.config.get('orientation', 'auto')
-                platform = self.config.get('platform', '')
-                
-                # Determine effective orientation
-                if orientation == 'auto':
-                    use_vertical = platform in self.vertical_platforms
-                elif orientation == 'vertical':
-                    use_vertical = True
-                else:  # horizontal
-                    use_vertical = False
-                
-                if use_vertical:
-                    quality = self.vertical_quality_presets.get(self.config.get('quality', 'medium'))
-                else:
-                    quality = self.quality_presets.get(self.config.get('quality', 'medium'))
+            quality = self._quality
+            self._apply_quality()
             
             # Use smart streaming approach - detects headless vs X11 automatically
             self._start_smart_streaming(quality)
             
             self.status = "live"
             self.start_time = time.time()
+            self._metrics_dirty = True
             start_time = datetime.now().isoformat()
             self.db.update_stream_status(self.config['id'], 'live', start_time)
             self.db.log_event(self.config['id'], 'stream_started')
@@ -944,6 +1307,50 @@ class StreamInstance:
             self.cleanup()
             return False, f"Error starting stream: {e}"
     
+    def _apply_quality(self):
+        """Derive the encoder figures from self._quality; metrics and the FFmpeg builders reuse these"""
+        self._bitrate_kbps = self._quality['bitrate_kbps']
+        self._framerate = self._quality['fps']
+        self._rate_args = _x264_rate_args(self._quality['bitrate'], self._quality['framerate'])
+        self._ffmpeg_argv_template = None  # Rebuilt by whichever launch path runs next
+    
+    def reconfigure(self, changes):
+        """Apply updated config fields, restarting only the processes they affect"""
+        changed = {field for field, value in changes.items() if not self._same_value(field, value)}
+        if not changed:
+            return True
+        
+        old_resolution = self._quality['resolution']
+        self.config.update({field: changes[field] for field in changed})
+        self._quality = self._resolve_quality()
+        self._quality_idx = _QUALITY_INDEX.get(self.config.get('quality', 'medium'))
+        if 'audio_config' in changed:
+            self.audio_config = None  # Re-parsed from config on next use
+        if 'multi_stream_targets' in changed:
+            self.multi_stream_targets = None
+        
+        if self.status != "live":
+            return True  # Picked up by the next start
+        
+        # What gets drawn (or its size) changed: renderer and FFmpeg both go
+        if changed & self.RENDERER_FIELDS or self._quality['resolution'] != old_resolution:
+            return self._full_restart()
+        
+        # Encoder settings or outputs changed: FFmpeg alone, rebuilt from the new config
+        if changed & self.FFMPEG_FIELDS:
+            self._apply_quality()
+            return self._restart_ffmpeg()
+        
+        return True  # Name/title/description only
+    
+    def _same_value(self, field, value):
+        """Whether value matches the current config; JSON columns may be held as raw text on
+        either side, so those compare parsed"""
+        current = self.config.get(field)
+        if field in StreamDatabase.STREAM_JSON_FIELDS:
+            return _parse_json_field(current, None) == _parse_json_field(value, None)
+        return current == value
+    
     def _start_smart_streaming(self, quality):
         """Start streaming using smart detection with progressive fallbacks"""
         try:
@@ -983,24 +1390,35 @@ class StreamInstance:
     
     def _detect_headless_system(self):
         """Detect if we're running on a headless system"""
-        try:
-            # Check if DISPLAY is set and accessible
-            if os.environ.get('DISPLAY'):
-                # Try to connect to X server
-                result = subprocess.run(['xset', 'q'], capture_output=True, timeout=5)
-                if result.returncode == 0:
-                    return False  # X11 available
-            
-            # Check if we're in a known headless environment
-            if os.path.exists('/usr/bin/chromium-browser') and not os.path.exists('/usr/bin/Xorg'):
+        return _detect_headless_system_cached()
+    
+    def _wait_for_port(self, port, timeout=5.0, proc=None):
+        """Poll until a local TCP port accepts connections; False on timeout or if proc exits"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if proc is not None and proc.poll() is not None:
+                return False
+            try:
+                socket.create_connection(('127.0.0.1', port), 0.05).close()
                 return True
-                
-            # Default to headless if uncertain
-            return True
-            
-        except Exception:
-            # If detection fails, assume headless
-            return True
+            except OSError:
+                time.sleep(0.05)
+        return False
+    
+    def _wait_for_display(self, display, timeout=5.0, proc=None):
+        """Poll until an X display accepts connections on its Unix socket"""
+        socket_path = f"/tmp/.X11-unix/X{display.lstrip(':')}"
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if proc is not None and proc.poll() is not None:
+                return False
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(socket_path)
+                return True
+            except OSError:
+                time.sleep(0.05)
+        return False
     
     def _start_headless_streaming(self, quality):
         """Start true headless streaming (no X11 required)"""
@@ -1020,24 +1438,28 @@ class StreamInstance:
         logger.info("Starting X11 streaming with virtual display...")
         
         # Start virtual display
-        display_port = f":9{self.config['id'][-1]}"
+        display_port = self._display
         self.processes['display'] = subprocess.Popen([
             'Xvfb', display_port, '-screen', '0', f"{quality['resolution']}x24", '-ac'
-        ])
+        ], stdin=subprocess.DEVNULL, close_fds=True, **_SPAWN_GROUP)
+        self._watch('display')
         
-        time.sleep(2)  # Allow Xvfb to start
+        if not self._wait_for_display(display_port, proc=self.processes['display']):
+            raise Exception(f"Xvfb failed to start on display {display_port}")
         
-        env = os.environ.copy()
-        env['DISPLAY'] = display_port
+        env = self._display_env
         
         # Start content renderer
         if self.config['type'] == 'html':
             self._start_html_renderer(env, quality)
+            if not self._wait_for_port(9222, proc=self.processes['renderer']):
+                logger.error(f"Chromium for stream {self.config['name']} never opened its debugging port")
+                raise Exception("Chromium failed to start listening on port 9222")
         elif self.config['type'] == 'pygame':
+            # No wait: x11grab captures the whole display, so frames before the window maps
+            # are just blank, and an early exit reaches the monitor through _watch
             self._start_pygame_renderer(env)
         
-        time.sleep(3)  # Allow content to start
-        
         # Start FFmpeg streaming
         self._start_ffmpeg_stream(env, quality)
     
@@ -1048,7 +1470,6 @@ class StreamInstance:
             chrome_port = 9222 + int(self.config['id'][-1])  # Unique port per stream
             
             # Detect available memory for optimization
-            import psutil
             total_memory_mb = psutil.virtual_memory().total // (1024 * 1024)
             
             chrome_cmd = [
@@ -1104,14 +1525,33 @@ class StreamInstance:
             chrome_cmd.append(self.config['source'])
             
             logger.info(f"Starting headless Chrome: {' '.join(chrome_cmd[:8])}...")
-            self.processes['chrome'] = subprocess.Popen(chrome_cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE)
+            self.processes['chrome'] = subprocess.Popen(
+                chrome_cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                close_fds=True,
+                **_SPAWN_GROUP
+            )
+            self._watch('chrome')
+            
+            # Chrome logs verbosely; keep draining stderr so it never blocks, but
+            # hold on to the tail for crash diagnosis
+            chrome_stderr_tail = deque(maxlen=200)
+            chrome_drain = Thread(
+                target=self._drain_tail,
+                args=(self.processes['chrome'].stderr, chrome_stderr_tail),
+                daemon=True
+            )
+            chrome_drain.start()
             
-            # Wait for Chrome to start and check if it's still running
-            time.sleep(3)
+            # Wait for the debug port to answer, bailing out early if Chrome dies
+            port_ready = self._wait_for_port(chrome_port, timeout=10.0, proc=self.processes['chrome'])
             
             if self.processes['chrome'].poll() is not None:
                 # Chrome died immediately
-                stderr_output = self.processes['chrome'].stderr.read().decode() if self.processes['chrome'].stderr else "No error output"
+                chrome_drain.join(timeout=1)  # Let the drain thread reach EOF
+                stderr_output = b''.join(chrome_stderr_tail).decode(errors='replace') or "No error output"
                 logger.error(f"Chrome died immediately. Error: {stderr_output[:1000]}")
                 
                 # Check for common memory-related errors
@@ -1126,23 +1566,10 @@ class StreamInstance:
                     
                 raise Exception(f"Chrome failed to start: {stderr_output[:500]}")
             
-            # Verify Chrome is responding on debug port
-            import socket
-            max_retries = 10
-            for i in range(max_retries):
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(1)
-                    result = sock.connect_ex(('localhost', chrome_port))
-                    sock.close()
-                    if result == 0:
-                        logger.info(f"Chrome debug port {chrome_port} is responding")
-                        break
-                except:
-                    pass
-                time.sleep(1)
+            if port_ready:
+                logger.info(f"Chrome debug port {chrome_port} is responding")
             else:
-                logger.warning(f"Chrome debug port {chrome_port} not responding after {max_retries}s")
+                logger.warning(f"Chrome debug port {chrome_port} not responding after 10s")
             
             # Start FFmpeg to capture from Chrome via CDP and stream
             self._start_headless_ffmpeg_stream(quality, chrome_port)
@@ -1154,19 +1581,20 @@ class StreamInstance:
     def _start_headless_pygame_streaming(self, quality):
         """Start headless Pygame streaming using memory surfaces"""
         try:
-            # Set SDL to use dummy video driver (no display needed)
-            env = os.environ.copy()
-            env['SDL_VIDEODRIVER'] = 'dummy'
-            env['SDL_AUDIODRIVER'] = 'dummy'
-            
-            # Start the pygame application
+            # Start the pygame application (SDL dummy drivers, no display needed)
             pygame_cmd = ['python3', self.config['source']]
             
             logger.info(f"Starting headless Pygame: {' '.join(pygame_cmd)}")
-            self.processes['pygame'] = subprocess.Popen(pygame_cmd, env=env)
-            
-            time.sleep(2)  # Allow pygame to start
+            self.processes['pygame'] = subprocess.Popen(
+                pygame_cmd,
+                env=self._headless_pygame_env,
+                stdin=subprocess.DEVNULL,
+                close_fds=True,
+                **_SPAWN_GROUP
+            )
+            self._watch('pygame')
             
+            # FFmpeg doesn't read from the script yet, so there is nothing to wait for
             # Start FFmpeg to capture pygame output and stream
             self._start_headless_pygame_ffmpeg(quality)
             
@@ -1176,6 +1604,7 @@ class StreamInstance:
     
     def _start_test_pattern_streaming(self, quality):
         """Start simple test pattern streaming - reliable fallback for low-memory systems"""
+        self._ffmpeg_builder = self._start_test_pattern_streaming
         try:
             logger.info("Starting test pattern streaming - reliable mode for low-memory VPS")
             
@@ -1190,29 +1619,24 @@ class StreamInstance:
                 'ffmpeg',
                 '-f', 'lavfi',
                 '-i', f'{pattern_type}=size={quality["resolution"]}:rate={quality["framerate"]}',
-                '-f', 'lavfi', 
-                '-i', f'anullsrc=channel_layout=stereo:sample_rate=44100',
+                *_SILENT_AUDIO_INPUT,
                 '-vf', f'drawtext=text="{stream_name}":x=10:y=10:fontsize=24:fontcolor=white,'
                        f'drawtext=text="Platform: {platform}":x=10:y=50:fontsize=18:fontcolor=yellow,'
                        f'drawtext=text="StreamDrop Active":x=10:y=80:fontsize=18:fontcolor=lime,'
-                       f'drawtext=text="%{{localtime\\:%Y-%m-%d %H\\:%M\\:%S}}":x=10:y={quality["resolution"].split("x")[1].rstrip()-40}:fontsize=16:fontcolor=white',
+                       f'drawtext=text="%{{localtime\\:%Y-%m-%d %H\\:%M\\:%S}}":x=10:y={quality["height"] - 40}:fontsize=16:fontcolor=white',
                 '-c:v', 'libx264',
                 '-preset', 'veryfast',
                 '-pix_fmt', 'yuv420p',
-                '-c:a', 'aac',
-                '-b:v', quality['bitrate'],
-                '-b:a', '128k',
-                '-maxrate', quality['bitrate'],
-                '-bufsize', str(int(quality['bitrate'].rstrip('k')) * 2) + 'k',
-                '-g', '60',
+                *_SILENT_AUDIO_CODEC,
+                *self._rate_args,
                 '-r', str(quality['framerate']),
+                *_LOW_LATENCY_OUTPUT,
                 '-f', 'flv',
                 self._build_rtmp_url(self.config['platform'], self.config['stream_key'], self.config.get('rtmp_url'))
             ]
             
             logger.info("Starting test pattern FFmpeg stream - this will work on any VPS size")
-            env = os.environ.copy()
-            self.processes['ffmpeg'] = subprocess.Popen(ffmpeg_cmd, env=env)
+            self._spawn_ffmpeg(ffmpeg_cmd, self._base_env)
             
             # No Chrome process needed for test pattern
             logger.info(f"Test pattern stream started successfully for {stream_name}")
@@ -1223,49 +1647,29 @@ class StreamInstance:
     
     def _start_headless_ffmpeg_stream(self, quality, chrome_port):
         """Start FFmpeg for headless HTML streaming"""
+        self._ffmpeg_builder = partial(self._start_headless_ffmpeg_stream, chrome_port=chrome_port)
         # For headless HTML, we'll use a simpler approach - generate test pattern for now
         # TODO: Implement proper Chrome DevTools Protocol screenshot capture
         ffmpeg_cmd = [
-            'ffmpeg',
-            '-f', 'lavfi',
-            '-i', f'testsrc=size={quality["resolution"]}:rate={quality["framerate"]}',
-            '-pix_fmt', 'yuv420p',
-            '-c:v', 'libx264',
-            '-preset', 'veryfast',
-            '-b:v', quality['bitrate'],
-            '-maxrate', quality['bitrate'],
-            '-bufsize', str(int(quality['bitrate'].rstrip('k')) * 2) + 'k',
-            '-g', '60',
-            '-f', 'flv',
+            *_testsrc_argv(quality['resolution'], quality['framerate'], quality['bitrate']),
             self._build_rtmp_url(self.config['platform'], self.config['stream_key'], self.config.get('rtmp_url'))
         ]
         
         logger.info(f"Starting headless FFmpeg stream...")
-        env = os.environ.copy()
-        self.processes['ffmpeg'] = subprocess.Popen(ffmpeg_cmd, env=env)
+        self._spawn_ffmpeg(ffmpeg_cmd, self._base_env)
     
     def _start_headless_pygame_ffmpeg(self, quality):
         """Start FFmpeg for headless Pygame streaming"""
+        self._ffmpeg_builder = self._start_headless_pygame_ffmpeg
         # For headless pygame, generate test pattern for now  
         # TODO: Implement proper pygame surface capture
         ffmpeg_cmd = [
-            'ffmpeg',
-            '-f', 'lavfi',
-            '-i', f'testsrc=size={quality["resolution"]}:rate={quality["framerate"]}',
-            '-pix_fmt', 'yuv420p',
-            '-c:v', 'libx264',
-            '-preset', 'veryfast',
-            '-b:v', quality['bitrate'],
-            '-maxrate', quality['bitrate'],
-            '-bufsize', str(int(quality['bitrate'].rstrip('k')) * 2) + 'k',
-            '-g', '60',
-            '-f', 'flv',
+            *_testsrc_argv(quality['resolution'], quality['framerate'], quality['bitrate']),
             self._build_rtmp_url(self.config['platform'], self.config['stream_key'], self.config.get('rtmp_url'))
         ]
         
         logger.info(f"Starting headless Pygame FFmpeg stream...")
-        env = os.environ.copy()
-        self.processes['ffmpeg'] = subprocess.Popen(ffmpeg_cmd, env=env)
+        self._spawn_ffmpeg(ffmpeg_cmd, self._base_env)
     
     
     def _start_html_renderer(self, env, quality):
@@ -1301,9 +1705,13 @@ class StreamInstance:
         self.processes['renderer'] = subprocess.Popen(
             chrome_cmd,
             env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            **_SPAWN_GROUP
         )
+        self._watch('renderer')
     
     def _start_pygame_renderer(self, env):
         """Start pygame script"""
@@ -1312,18 +1720,22 @@ class StreamInstance:
         
         self.processes['renderer'] = subprocess.Popen([
             'python3', self.config['source']
-        ], env=env)
+        ], env=env, stdin=subprocess.DEVNULL, close_fds=True, **_SPAWN_GROUP)
+        self._watch('renderer')
     
     def _start_ffmpeg_stream(self, env, quality):
         """Start FFmpeg streaming process with audio and multi-streaming support"""
         display_port = env['DISPLAY']
         
+        self._ffmpeg_builder = partial(self._start_ffmpeg_stream, env)
+        
         # Build FFmpeg command
         ffmpeg_cmd = ['ffmpeg']
         
         # Video input - X11 screen capture
         ffmpeg_cmd.extend([
             '-f', 'x11grab',
+            '-fflags', '+nobuffer',  # Live capture: don't buffer while probing the input
             '-video_size', quality['resolution'],
             '-framerate', quality['framerate'],
             '-i', display_port
@@ -1341,17 +1753,14 @@ class StreamInstance:
                 ffmpeg_cmd.extend(['-f', 'pulse', '-i', audio_device])
         else:
             # No audio - add silent audio track
-            ffmpeg_cmd.extend(['-f', 'lavfi', '-i', 'anullsrc'])
+            ffmpeg_cmd.extend(_SILENT_AUDIO_INPUT)
         
         # Video encoding settings
         ffmpeg_cmd.extend([
             '-c:v', 'libx264',
             '-preset', self.audio_config.get('video_preset', 'veryfast'),
-            '-b:v', quality['bitrate'],
-            '-maxrate', quality['bitrate'],
-            '-bufsize', str(int(quality['bitrate'].replace('k', '')) * 2) + 'k',
             '-pix_fmt', 'yuv420p',
-            '-g', str(int(quality['framerate']) * 2)  # GOP size = 2 * framerate
+            *self._rate_args
         ])
         
         # Audio encoding settings
@@ -1362,55 +1771,115 @@ class StreamInstance:
                 '-ar', str(self.audio_config.get('sample_rate', 44100))
             ])
         else:
-            ffmpeg_cmd.extend(['-c:a', 'aac', '-b:a', '128k'])
+            ffmpeg_cmd.extend(_SILENT_AUDIO_CODEC)
         
-        # Multi-streaming support
-        targets = self._get_stream_targets()
+        # Multi-streaming support; the common single-target case skips target resolution
+        targets = self._get_stream_targets() if self.multi_stream_targets else None
         
-        if len(targets) == 1:
+        if not targets or len(targets) == 1:
             # Single stream
-            ffmpeg_cmd.extend(['-f', 'flv', targets[0]])
+            primary_target = targets[0] if targets else self._build_rtmp_url(
+                self.config['platform'], self.config['stream_key'], self.config.get('rtmp_url'))
+            ffmpeg_cmd.extend([*_LOW_LATENCY_OUTPUT, '-f', 'flv', primary_target])
         else:
-            # Multi-streaming using tee muxer
-            ffmpeg_cmd.extend(['-f', 'tee'])
-            tee_outputs = '|'.join([f'[f=flv]{target}' for target in targets])
+            # Multi-streaming using tee muxer. Each slave gets its own FIFO and
+            # onfail=ignore, so one flaky ingest is dropped instead of killing the rest
+            ffmpeg_cmd.extend(['-map', '0:v', '-map', '1:a', '-f', 'tee'])
+            tee_outputs = '|'.join(
+                f'[f=flv:onfail=ignore:use_fifo=1:fifo_options=queue_size=512\\:drop_pkts_on_overflow=1]{target}'
+                for target in targets
+            )
             ffmpeg_cmd.append(tee_outputs)
         
         logger.info(f"Starting FFmpeg with command: {' '.join(ffmpeg_cmd[:10])}... (truncated)")
         
-        self.processes['ffmpeg'] = subprocess.Popen(
-            ffmpeg_cmd,
+        self._spawn_ffmpeg(ffmpeg_cmd, env)
+    
+    def _spawn_ffmpeg(self, ffmpeg_cmd, env):
+        """Spawn FFmpeg as processes['ffmpeg'] with machine-readable progress on stdout"""
+        argv = [ffmpeg_cmd[0], '-progress', 'pipe:1', '-nostats'] + ffmpeg_cmd[1:]
+        
+        # Cap encoder threads to this stream's share of the CPUs (applied per spawn, so
+        # restarts pick up the current budget)
+        if self.ffmpeg_threads and '-c:v' in argv:
+            codec_at = argv.index('-c:v') + 2
+            argv[codec_at:codec_at] = ['-threads', str(self.ffmpeg_threads)]
+        process = subprocess.Popen(
+            argv,
             env=env,
+            stdin=subprocess.DEVNULL,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            close_fds=True,
+            **_SPAWN_GROUP
         )
+        
+        self.processes['ffmpeg'] = process
+        self._watch('ffmpeg')
+        
+        # Remember the command so _restart_ffmpeg can respawn it without rebuilding
+        self._ffmpeg_argv_template = ffmpeg_cmd
+        self._ffmpeg_env = env
+        
+        self._live_stats = {}
+        self._progress_time = time.monotonic()  # Grace period until the first report
+        Thread(target=self._progress_pump, args=(process, self._live_stats), daemon=True).start()
+        return process
+    
+    def _watch(self, name):
+        """Hand a freshly spawned child to the manager's exit watcher, if one is attached"""
+        if self.process_watcher is not None:
+            self.process_watcher(self, name, self.processes[name])
+    
+    def _progress_pump(self, process, stats):
+        """Read FFmpeg -progress key=value lines into stats until the pipe closes"""
+        try:
+            for line in process.stdout:
+                key, sep, value = line.decode(errors='replace').strip().partition('=')
+                if sep:
+                    stats[key] = value
+                
+                # Each report ends with progress=...; refresh the metrics snapshot at most once a second
+                if key == 'progress' and stats is self._live_stats:
+                    self._progress_time = now = time.monotonic()
+                    if self.status == 'live' and now - self._metrics_time >= 1.0:
+                        self._publish_metrics()
+        except (OSError, ValueError):
+            pass  # Pipe closed underneath us during cleanup
+    
+    @staticmethod
+    def _drain_tail(stream, tail):
+        """Read a child's pipe to EOF, keeping only the last lines in tail"""
+        try:
+            for line in stream:
+                tail.append(line)
+        except (OSError, ValueError):
+            pass
     
     def _get_stream_targets(self):
         """Get all streaming targets (primary + multi-stream targets)"""
-        targets = []
-        
         # Primary target
         primary_target = self._build_rtmp_url(self.config['platform'], self.config['stream_key'], self.config.get('rtmp_url'))
-        targets.append(primary_target)
         
         # Additional multi-stream targets
-        for target in self.multi_stream_targets:
-            if target.get('enabled', True):
-                target_url = self._build_rtmp_url(target['platform'], target['stream_key'], target.get('rtmp_url'))
-                targets.append(target_url)
+        extra_targets = [
+            self._build_rtmp_url(target['platform'], target['stream_key'], target.get('rtmp_url'))
+            for target in self.multi_stream_targets
+            if target.get('enabled', True)
+        ]
         
-        return targets
+        # Drop duplicate URLs (order-preserving) so tee never pushes the same ingest twice
+        return list(dict.fromkeys([primary_target, *extra_targets]))
     
     def _build_rtmp_url(self, platform, stream_key, custom_url=None):
         """Build RTMP URL for a platform"""
         if platform == 'custom' and custom_url:
-            return f"{custom_url}/{stream_key}"
+            return _compose_rtmp_url(f"{custom_url}/", stream_key)
         
-        platform_config = self.platform_configs.get(platform)
-        if not platform_config:
+        base_url = self._rtmp_url_templates.get(platform)
+        if base_url is None:
             raise Exception(f"Unsupported platform: {platform}")
         
-        return f"{platform_config['rtmp_url']}{stream_key}"
+        return _compose_rtmp_url(base_url, stream_key)
     
     def stop_streaming(self):
         """Stop the streaming process"""
@@ -1424,134 +1893,174 @@ class StreamInstance:
     
     def cleanup(self):
         """Clean up all processes"""
-        for process_name, process in self.processes.items():
-            if process:
-                try:
-                    process.terminate()
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    try:
-                        process.kill()
-                        process.wait(timeout=2)
-                    except:
-                        pass
-                except:
-                    pass
+        self._reap_children(self._signal_children())
+    
+    def _signal_children(self):
+        """SIGTERM every running child's process group; returns the children that were running"""
+        running = [p for p in self.processes.values() if p and p.poll() is None]
+        
+        # Each child leads its own process group, so signal whole groups and let them exit together
+        for process in running:
+            self._signal_group(process, signal.SIGTERM)
+        return running
+    
+    def _reap_children(self, running, deadline=None):
+        """Wait for signalled children until one shared deadline, SIGKILL stragglers, forget them all"""
+        if deadline is None:
+            deadline = time.monotonic() + 5
+        
+        # Sequential waits against the same deadline: wall time is the slowest exit, not the sum
+        for process in running:
+            self._wait_quietly(process, timeout=max(0, deadline - time.monotonic()))
+        
+        stragglers = [p for p in running if p.poll() is None]
+        for process in stragglers:
+            self._signal_group(process, signal.SIGKILL)
+        for process in stragglers:
+            self._wait_quietly(process, timeout=2)
         
         self.processes.clear()
+        self._psutil_handles.clear()
+        self._flush_health()
+    
+    @staticmethod
+    def _signal_group(process, sig):
+        """Send a signal to a child's process group (pgid == pid, see _SPAWN_GROUP)"""
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            # Not a group leader (or already gone); fall back to the process itself
+            try:
+                process.send_signal(sig)
+            except OSError:
+                pass
     
-    def get_uptime(self):
-        """Get current stream uptime"""
+    @staticmethod
+    def _wait_quietly(process, timeout=5):
+        """Wait for a process to exit, ignoring timeouts"""
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            pass
+    
+    def get_uptime(self, now=None):
+        """Get current stream uptime (pass now= to share one clock read across streams)"""
         if self.status != "live":
             return "0m"
         
-        stream_data = self.db.get_stream(self.config['id'])
-        if stream_data and stream_data['start_time']:
+        if self.start_time is not None:
+            uptime_seconds = (now or time.time()) - self.start_time
+        else:
+            # Only hit the DB when this instance didn't start the stream itself
+            stream_data = self.db.get_stream(self.config['id'])
+            if not (stream_data and stream_data['start_time']):
+                return "0m"
             start_time = datetime.fromisoformat(stream_data['start_time'])
             uptime_seconds = (datetime.now() - start_time).total_seconds()
-            
-            hours = int(uptime_seconds // 3600)
-            minutes = int((uptime_seconds % 3600) // 60)
-            
-            if hours > 0:
-                return f"{hours}h {minutes}m"
-            else:
-                return f"{minutes}m"
         
-        return "0m"
+        hours = int(uptime_seconds // 3600)
+        minutes = int((uptime_seconds % 3600) // 60)
+        
+        if hours > 0:
+            return f"{hours}h {minutes}m"
+        else:
+            return f"{minutes}m"
     
     def collect_metrics(self):
         """Collect current stream performance metrics"""
         if self.status != "live":
             return {}
         
+        # Normally the FFmpeg progress pump keeps the snapshot fresh; sample inline only
+        # when it has gone quiet (FFmpeg not running or not reporting yet)
+        with self._metrics_lock:
+            metrics = dict(self.metrics) if time.monotonic() - self._metrics_time < 2.0 else None
+        if metrics is None:
+            metrics = self._publish_metrics()
+        
+        metrics['duration_seconds'] = int(time.time() - (self.start_time or time.time()))
+        return metrics
+    
+    def _publish_metrics(self):
+        """Sample metrics and store them as the current snapshot"""
+        sample = self._sample()
         metrics = {
-            'fps': self._get_fps(),
-            'bitrate': self._get_bitrate(),
-            'frame_drops': self._get_frame_drops(),
-            'cpu_usage': self._get_cpu_usage(),
-            'memory_usage': self._get_memory_usage(),
-            'bandwidth_mbps': self._get_bandwidth(),
+            'fps': sample.fps,
+            'bitrate': sample.bitrate,
+            'frame_drops': sample.drops,
+            'cpu_usage': sample.cpu,
+            'memory_usage': sample.mem,
+            'bandwidth_mbps': sample.bandwidth,
             'viewers': 0,  # TODO: Implement viewer tracking
             'duration_seconds': int(time.time() - (self.start_time or time.time()))
         }
         
-        # Store metrics for trend analysis
-        self.metrics = metrics
+        # Coarse buckets so jitter in a steady stream doesn't count as a change;
+        # any new dropped frame does
+        signature = (round(sample.fps), round(sample.bitrate, -2), sample.drops,
+                     round(sample.cpu / 5), round(sample.mem / 50))
         
-        return metrics
-    
-    def _get_fps(self):
-        """Calculate current FPS from FFmpeg stats"""
-        try:
-            if 'ffmpeg' not in self.processes or not self.processes['ffmpeg']:
-                return 0
-            
-            # Try to read FFmpeg stderr for stats
-            # This is a simplified implementation
-            return float(self.quality_presets.get(self.config.get('quality', 'medium'), {}).get('framerate', '30'))
-        except:
-            return 0
-    
-    def _get_bitrate(self):
-        """Get current bitrate from FFmpeg stats"""
-        try:
-            quality_preset = self.quality_presets.get(self.config.get('quality', 'medium'), {})
-            bitrate_str = quality_preset.get('bitrate', '2500k')
-            return float(bitrate_str.replace('k', '')) if 'k' in bitrate_str else float(bitrate_str)
-        except:
-            return 0
-    
-    def _get_frame_drops(self):
-        """Get frame drop count"""
-        # TODO: Parse actual FFmpeg stats
-        return 0
-    
-    def _get_cpu_usage(self):
-        """Get CPU usage for stream processes"""
-        try:
-            import psutil
-            total_cpu = 0
-            process_count = 0
-            
-            for proc_name, proc in self.processes.items():
-                if proc and proc.poll() is None:
-                    try:
-                        p = psutil.Process(proc.pid)
-                        total_cpu += p.cpu_percent()
-                        process_count += 1
-                    except:
-                        pass
-            
-            return total_cpu / max(process_count, 1)
-        except ImportError:
-            return 0
-    
-    def _get_memory_usage(self):
-        """Get memory usage for stream processes in MB"""
-        try:
-            import psutil
-            total_memory = 0
-            
-            for proc_name, proc in self.processes.items():
-                if proc and proc.poll() is None:
-                    try:
-                        p = psutil.Process(proc.pid)
-                        total_memory += p.memory_info().rss / 1024 / 1024  # Convert to MB
-                    except:
-                        pass
-            
-            return total_memory
-        except ImportError:
-            return 0
+        # Store metrics for trend analysis
+        with self._metrics_lock:
+            self.metrics = metrics
+            self._metrics_time = time.monotonic()
+            if signature != self._metrics_signature:
+                self._metrics_signature = signature
+                self._metrics_dirty = True
+        
+        return dict(metrics)
+    
+    def _sample(self):
+        """Sample process stats and encoder figures in a single pass"""
+        cpu, mem = self._sample_proc_stats()
+        
+        if self.processes.get('ffmpeg'):
+            # Live -progress figures, falling back to the preset until the first report
+            stats = self._live_stats
+            fps = _parse_stat(stats.get('fps'), self._framerate)
+            bitrate = _parse_stat(stats.get('bitrate', '').removesuffix('kbits/s'), self._bitrate_kbps)
+            drops = int(_parse_stat(stats.get('drop_frames'), 0))
+        else:
+            fps, bitrate, drops = 0, self._bitrate_kbps, 0
+        
+        return SimpleNamespace(
+            cpu=cpu,
+            mem=mem,
+            fps=fps,
+            bitrate=bitrate,
+            bandwidth=bitrate / 1000,  # Convert kbps to Mbps
+            drops=drops
+        )
     
-    def _get_bandwidth(self):
-        """Estimate bandwidth usage in Mbps"""
-        try:
-            bitrate_kbps = self._get_bitrate()
-            return bitrate_kbps / 1000  # Convert kbps to Mbps
-        except:
-            return 0
+    def _get_psutil(self, name, proc):
+        """Get a cached psutil handle for a child process"""
+        handle = self._psutil_handles.get(name)
+        if handle is None or handle.pid != proc.pid or not handle.is_running():
+            handle = psutil.Process(proc.pid)
+            handle.cpu_percent(None)  # Prime the baseline so the next call measures an interval
+            self._psutil_handles[name] = handle
+        return handle
+    
+    def _sample_proc_stats(self):
+        """Get (average CPU %, total memory MB) for stream processes in one pass"""
+        total_cpu = 0
+        total_memory = 0
+        process_count = 0
+        
+        for proc_name, proc in list(self.processes.items()):  # Also called from the progress pump
+            if proc and proc.poll() is None:
+                try:
+                    # as_dict reads both under one oneshot() instead of separate /proc round-trips
+                    info = self._get_psutil(proc_name, proc).as_dict(attrs=('cpu_percent', 'memory_info'))
+                    if info['memory_info'] is None:
+                        continue  # Access denied or zombie; nothing to count
+                    total_cpu += info['cpu_percent'] or 0
+                    total_memory += info['memory_info'].rss / 1024 / 1024  # Convert to MB
+                    process_count += 1
+                except psutil.Error:
+                    self._psutil_handles.pop(proc_name, None)
+        
+        return total_cpu / max(process_count, 1), total_memory
     
     def calculate_health_score(self):
         """Calculate overall stream health score (0-100)"""
@@ -1582,14 +2091,17 @@ class StreamInstance:
             
             self.health_score = health_score
             
-            # Log health metrics
-            self.db.log_health_score(
+            # Buffer health metrics; they're written in batches by _flush_health
+            self._health_buffer.append((
                 self.config['id'],
                 health_score,
                 connection_score,
                 performance_score,
-                stability_score
-            )
+                stability_score,
+                datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')  # UTC, same format as CURRENT_TIMESTAMP
+            ))
+            if time.time() - self._last_health_flush > 10:
+                self._flush_health()
             
             return health_score
             
@@ -1597,6 +2109,19 @@ class StreamInstance:
             logger.error(f"Error calculating health score: {e}")
             return 50.0  # Default to moderate health on error
     
+    def _flush_health(self):
+        """Write buffered health scores to the database in one batch"""
+        self._last_health_flush = time.time()
+        if not self._health_buffer:
+            return
+        
+        rows = list(self._health_buffer)
+        self._health_buffer.clear()
+        try:
+            self.db.log_health_scores_batch(rows)
+        except Exception as e:
+            logger.error(f"Error flushing health scores: {e}")
+    
     def detect_failure_type(self):
         """Detect the type of failure occurring"""
         failure_types = []
@@ -1661,6 +2186,7 @@ class StreamInstance:
             if success:
                 logger.info(f"Recovery successful for {self.config['name']} in {recovery_duration:.1f}s")
                 self.failure_count = max(0, self.failure_count - 1)  # Reduce failure count on success
+                self._metrics_dirty = True  # Stability score changed
                 self.db.log_event(self.config['id'], 'recovery_success', {
                     'strategy': strategy,
                     'duration': recovery_duration,
@@ -1669,6 +2195,7 @@ class StreamInstance:
             else:
                 logger.error(f"Recovery failed for {self.config['name']}")
                 self.failure_count += 1
+                self._metrics_dirty = True
                 self.db.create_alert(
                     self.config['id'],
                     'recovery_failed',
@@ -1725,22 +2252,50 @@ class StreamInstance:
             logger.error(f"Error executing recovery strategy {strategy}: {e}")
             return False
     
+    def _descendants(self):
+        """Get psutil handles for every live descendant of this stream's processes"""
+        descendants = []
+        for proc in self.processes.values():
+            if proc and proc.poll() is None:
+                try:
+                    descendants.extend(psutil.Process(proc.pid).children(recursive=True))
+                except psutil.Error:
+                    pass
+        return descendants
+    
+    def _terminate_process(self, proc, grace_ms=500):
+        """SIGTERM a process's whole group, escalating to SIGKILL if it hasn't exited within grace_ms"""
+        if proc is None or proc.poll() is not None:
+            return
+        
+        # Signal the group so tee/filter helpers die with FFmpeg instead of holding the socket
+        self._signal_group(proc, signal.SIGTERM)
+        try:
+            proc.wait(timeout=grace_ms / 1000)
+        except subprocess.TimeoutExpired:
+            pass
+        
+        # SIGKILL whatever is left in the group, even if the leader exited cleanly
+        self._signal_group(proc, signal.SIGKILL)
+        try:
+            proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Process {proc.pid} did not exit after SIGKILL")
+    
     def _restart_ffmpeg(self):
         """Restart only the FFmpeg process"""
         try:
             # Stop FFmpeg
-            if 'ffmpeg' in self.processes and self.processes['ffmpeg']:
-                self.processes['ffmpeg'].terminate()
-                self.processes['ffmpeg'].wait(timeout=5)
-            
-            time.sleep(2)
-            
-            # Restart FFmpeg
-            env = os.environ.copy()
-            env['DISPLAY'] = f":9{self.config['id'][-1]}"
-            
-            quality = self.quality_presets.get(self.config.get('quality', 'medium'))
-            self._start_ffmpeg_stream(env, quality)
+            self._terminate_process(self.processes.get('ffmpeg'))
+            
+            # Restart FFmpeg with the exact command the stream was started with, or rebuild
+            # it (after a config change) through the launch path that built it
+            if self._ffmpeg_argv_template:
+                self._spawn_ffmpeg(self._ffmpeg_argv_template, self._ffmpeg_env)
+            elif self._ffmpeg_builder:
+                self._ffmpeg_builder(self._quality)
+            else:
+                return self._full_restart()
             
             return True
             
@@ -1752,21 +2307,13 @@ class StreamInstance:
         """Restart the content renderer process"""
         try:
             # Stop renderer
-            if 'renderer' in self.processes and self.processes['renderer']:
-                self.processes['renderer'].terminate()
-                self.processes['renderer'].wait(timeout=5)
-            
-            time.sleep(2)
+            self._terminate_process(self.processes.get('renderer'))
             
             # Restart renderer
-            env = os.environ.copy()
-            env['DISPLAY'] = f":9{self.config['id'][-1]}"
-            quality = self.quality_presets.get(self.config.get('quality', 'medium'))
-            
             if self.config['type'] == 'html':
-                self._start_html_renderer(env, quality)
+                self._start_html_renderer(self._display_env, self._quality)
             elif self.config['type'] == 'pygame':
-                self._start_pygame_renderer(env)
+                self._start_pygame_renderer(self._display_env)
             
             return True
             
@@ -1784,56 +2331,33 @@ class StreamInstance:
             logger.error(f"Failed to restart display: {e}")
             return False
     
-    def _load_platform_configs(self):
-        """Load platform configurations from database"""
-        try:
-            platforms = self.db.get_platform_configs()
-            self.platform_configs = {p['platform_name']: p for p in platforms}
-        except Exception as e:
-            logger.error(f"Error loading platform configs: {e}")
-            # Fallback to hardcoded configs
-            self.platform_configs = {
-                'youtube': {'rtmp_url': 'rtmp://a.rtmp.youtube.com/live2/', 'max_bitrate': 9000},
-                'twitch': {'rtmp_url': 'rtmp://live.twitch.tv/live/', 'max_bitrate': 6000},
-                'facebook': {'rtmp_url': 'rtmps://live-api-s.facebook.com:443/rtmp/', 'max_bitrate': 4000}
-            }
-    
     def _reduce_quality(self):
         """Reduce stream quality to improve performance"""
         try:
-            current_quality = self.config.get('quality', 'medium')
-            quality_levels = ['ultra', 'high', 'medium', 'low']
+            if self._quality_idx is None or self._quality_idx >= len(QUALITY_LEVELS) - 1:
+                return False  # Custom settings, or already at the lowest preset
             
-            if current_quality in quality_levels:
-                current_index = quality_levels.index(current_quality)
-                if current_index < len(quality_levels) - 1:
-                    new_quality = quality_levels[current_index + 1]
-                    
-                    # Update stream quality
-                    self.config['quality'] = new_quality
-                    self.db.update_stream(self.config['id'], {'quality': new_quality})
-                    
-                    logger.info(f"Reduced quality from {current_quality} to {new_quality}")
-                    
-                    # Restart with new quality
-                    return self._full_restart()
+            current_quality = QUALITY_LEVELS[self._quality_idx]
+            new_quality = QUALITY_LEVELS[self._quality_idx + 1]
             
-            return False  # Can't reduce quality further
+            # Restart with new quality; only FFmpeg when the resolution is unchanged (e.g. ultra -> high)
+            if not self.reconfigure({'quality': new_quality}):
+                return False
+            
+            # Persist only once the stream is actually running at the new quality
+            self.db.update_stream(self.config['id'], {'quality': new_quality})
+            logger.info(f"Reduced quality from {current_quality} to {new_quality}")
+            return True
             
         except Exception as e:
             logger.error(f"Failed to reduce quality: {e}")
             return False
     
     def _reconnect_stream(self):
-        """Reconnect the stream by restarting FFmpeg with delay"""
+        """Reconnect the stream by restarting FFmpeg"""
         try:
-            # Stop FFmpeg with a longer wait
-            if 'ffmpeg' in self.processes and self.processes['ffmpeg']:
-                self.processes['ffmpeg'].terminate()
-                self.processes['ffmpeg'].wait(timeout=10)
-            
-            # Wait before reconnecting
-            time.sleep(5)
+            # Stop FFmpeg; a process wedged on a dead RTMP socket gets SIGKILLed after the grace window
+            self._terminate_process(self.processes.get('ffmpeg'))
             
             # Restart FFmpeg
             return self._restart_ffmpeg()
@@ -1845,166 +2369,365 @@ class StreamInstance:
     def _full_restart(self):
         """Perform a complete stream restart"""
         try:
+            # Children that left our process groups would be reparented to init once their
+            # parents die, so find them while the tree is still intact
+            leftovers = self._descendants()
+            
             # Clean up all processes
             self.cleanup()
             
+            for child in leftovers:
+                try:
+                    if child.is_running():
+                        child.kill()
+                except psutil.Error:
+                    pass
+            
             # Wait before restarting
             time.sleep(3)
             
-            # Restart the entire stream
+            # Restart the entire stream (start_streaming refuses while status is live)
+            self.status = "recovering"
             success, message = self.start_streaming()
+            if not success:
+                self._mark_failed()
             return success
             
         except Exception as e:
             logger.error(f"Failed to perform full restart: {e}")
+            self._mark_failed()
             return False
+    
+    def _mark_failed(self):
+        """Leave 'recovering' for 'error' so the stream can be started again (and the UI shows it)"""
+        self.status = "error"
+        try:
+            self.db.update_stream_status(self.config['id'], 'error')
+        except Exception as e:
+            logger.error(f"Failed to record error status for {self.config['name']}: {e}")
 
 class StreamManager:
     """Main stream manager class"""
     
+    # Statuses a stream passes through while its processes are being (re)started
+    _TRANSITIONAL = frozenset({'starting', 'recovering'})
+    
     def __init__(self):
         self.db = StreamDatabase()
+        # Copy-on-write: writers rebind a new dict under stream_lock, readers just take the reference
         self.active_streams = {}
         self.monitor_thread = None
         self.monitoring = False
+        self._thread_budget = os.cpu_count() or 1
+        
+        # Monitor writes (metrics, alerts, events) queued per cycle and committed together
+        self._pending_writes = deque(maxlen=4096)
+        
+        # Recoveries run in parallel off the monitor thread; at most one in flight per stream
+        self._recovery_pool = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix='recovery'
+        )
+        self._in_flight = {}
+        # Spawning a stream's processes can take seconds, so starts run off the request thread
+        self._start_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='start')
+        # Config changes to running streams are applied in the background, in submission order
+        self._restart_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='restart')
+        
+        # The monitor is an asyncio loop on its own thread; each child's pidfd is a reader
+        # on it, so exits wake the monitor without polling. (Not SIGCHLD + waitpid(-1):
+        # reaping there would steal exit statuses from Popen, and Python signal handlers
+        # only run on the main thread, which the web server owns.)
+        self._loop = asyncio.new_event_loop()
+        self._wake = asyncio.Event()
+        self._exited = []  # (stream_id, name, proc) reported since the last monitor pass
+        self._pid_index = {}  # pid -> (stream_id, name, proc) for every watched child not yet seen exiting
+        self._pidfd_ok = True  # False once any child couldn't be watched; poll it every tick then
     
     def start_monitoring(self):
         """Start stream monitoring thread"""
         self.monitoring = True
-        self.monitor_thread = Thread(target=self._monitor_streams, daemon=True)
+        self.monitor_thread = Thread(target=self._loop.run_until_complete, args=(self._monitor_streams(),), daemon=True)
         self.monitor_thread.start()
         logger.info("Stream monitoring started")
     
     def stop_monitoring(self):
         """Stop stream monitoring"""
         self.monitoring = False
+        self._wake_monitor()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
     
-    def _monitor_streams(self):
+    def _wake_monitor(self):
+        """Wake the monitor loop (safe from any thread)"""
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            pass  # Loop already closed
+    
+    def _watch_process(self, instance, name, proc):
+        """Register a child's pidfd so the monitor wakes as soon as it exits"""
+        entry = (instance.config['id'], name, proc)
+        self._pid_index[proc.pid] = entry
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):
+            self._pidfd_ok = False  # No pidfd support (or already reaped); the metrics tick polls
+            return
+        
+        self._loop.call_soon_threadsafe(
+            self._loop.add_reader, pidfd, self._on_exit, pidfd, entry
+        )
+    
+    def _on_exit(self, pidfd, data):
+        """Loop callback: a watched pidfd became readable, i.e. the child exited"""
+        self._loop.remove_reader(pidfd)
+        os.close(pidfd)
+        self._pid_index.pop(data[2].pid, None)
+        self._exited.append(data)
+        self._wake.set()
+    
+    def _poll_pid_index(self):
+        """Fallback sweep: report watched children that exited without a pidfd wakeup"""
+        # poll(), not os.waitpid(): Popen must reap its own child to keep its returncode
+        for pid, entry in list(self._pid_index.items()):
+            if entry[2].poll() is not None:
+                self._pid_index.pop(pid, None)
+                self._exited.append(entry)
+    
+    def _rebalance_threads(self):
+        """Split the CPU budget evenly across active streams (caller holds stream_lock)"""
+        threads_per_stream = max(1, self._thread_budget // max(1, len(self.active_streams)))
+        for stream_instance in self.active_streams.values():
+            stream_instance.ffmpeg_threads = threads_per_stream
+    
+    async def _monitor_streams(self):
         """Monitor active streams for health and errors"""
         metrics_interval = 30  # Collect metrics every 30 seconds
-        last_metrics_time = time.time()
+        metrics_heartbeat = 300  # ...but record unchanged streams only every 5 minutes
+        progress_stale = 2 * metrics_interval  # FFmpeg silent this long counts as a change
+        poll_fallback = 300  # pidfds report exits; polling every child is only a safety net
+        next_metrics_time = time.time() + metrics_interval
+        next_poll_time = time.time() + poll_fallback
         
         while self.monitoring:
             try:
-                current_time = time.time()
+                # Sleep until a watched child exits, we're woken up, or metrics are due
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=max(0, next_metrics_time - time.time()))
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
                 
-                with stream_lock:
-                    for stream_id, stream_instance in list(self.active_streams.items()):
-                        # Check if processes are still running
-                        if stream_instance.status == "live":
-                            all_running = True
-                            dead_processes = []
-                            
-                            for process_name, process in stream_instance.processes.items():
-                                if process and process.poll() is not None:
-                                    logger.warning(f"Process {process_name} died for stream {stream_id}")
-                                    dead_processes.append(process_name)
-                                    all_running = False
-                            
-                            if not all_running:
-                                logger.error(f"Stream {stream_id} failed, attempting intelligent recovery")
-                                
-                                # Detect failure types for intelligent recovery
-                                failure_types = stream_instance.detect_failure_type()
-                                
-                                # Attempt intelligent recovery
-                                recovery_success, recovery_message = stream_instance.attempt_recovery(failure_types)
-                                
-                                if recovery_success:
-                                    logger.info(f"Successfully recovered stream {stream_id}: {recovery_message}")
-                                    # Stream should be running again
-                                    continue
-                                else:
-                                    logger.error(f"Recovery failed for stream {stream_id}: {recovery_message}")
-                                    stream_instance.cleanup()
-                                    stream_instance.status = "error"
-                                    self.db.update_stream_status(stream_id, 'error')
-                                    self.db.log_event(stream_id, 'recovery_failed', {
-                                        'reason': 'auto_recovery_failed',
-                                        'dead_processes': dead_processes,
-                                        'failure_types': failure_types,
-                                        'recovery_message': recovery_message
-                                    })
-                            
-                            # Collect performance metrics and health scoring
-                            elif current_time - last_metrics_time >= metrics_interval:
-                                try:
-                                    metrics = stream_instance.collect_metrics()
-                                    if metrics:
-                                        self.db.log_metrics(stream_id, metrics)
-                                        
-                                        # Calculate and track health score
-                                        health_score = stream_instance.calculate_health_score()
-                                        
-                                        # Check for performance issues
-                                        self._check_performance_alerts(stream_id, metrics)
-                                        
-                                        # Predictive recovery for degrading health
-                                        if health_score < 50 and not stream_instance.recovery_in_progress:
-                                            logger.warning(f"Stream {stream_id} health degrading: {health_score:.1f}%")
-                                            
-                                            # Attempt preemptive recovery
-                                            failure_types = stream_instance.detect_failure_type()
-                                            if failure_types and 'unknown_failure' not in failure_types:
-                                                logger.info(f"Starting preemptive recovery for {stream_id}")
-                                                recovery_success, recovery_message = stream_instance.attempt_recovery(failure_types)
-                                                
-                                                if recovery_success:
-                                                    self.db.create_alert(
-                                                        stream_id,
-                                                        'preemptive_recovery',
-                                                        'info',
-                                                        f'Preemptive recovery successful: {recovery_message}'
-                                                    )
-                                        
-                                except Exception as e:
-                                    logger.error(f"Error collecting metrics for {stream_id}: {e}")
+                current_time = time.time()
+                collect_metrics = current_time >= next_metrics_time
+                if collect_metrics:
+                    next_metrics_time = current_time + metrics_interval
+                if collect_metrics and (not self._pidfd_ok or current_time >= next_poll_time):
+                    next_poll_time = current_time + poll_fallback
+                    self._poll_pid_index()
                 
-                # Update metrics collection timestamp
-                if current_time - last_metrics_time >= metrics_interval:
-                    last_metrics_time = current_time
+                exited = {}
+                for stream_id, process_name, proc in self._exited:
+                    exited.setdefault(stream_id, []).append((process_name, proc))
+                self._exited.clear()
                 
-                time.sleep(10)  # Check every 10 seconds
+                # Locks, psutil and SQLite block, so that work runs on a worker thread
+                # and the loop stays free to take exit notifications
+                await asyncio.to_thread(
+                    self._check_streams, exited, collect_metrics, current_time, metrics_heartbeat, progress_stale
+                )
+                await asyncio.to_thread(self._flush_pending_writes)
                 
             except Exception as e:
                 logger.error(f"Error in stream monitoring: {e}")
-                time.sleep(5)
+                await asyncio.sleep(5)
+    
+    def _check_streams(self, exited, collect_metrics, current_time, metrics_heartbeat, progress_stale=60):
+        """One monitor pass: recover streams with dead processes, collect metrics on the tick"""
+        stream_ids = tuple(self.active_streams)
+        
+        # Recovery and metrics run outside stream_lock so API calls aren't blocked;
+        # the per-stream lifecycle_lock keeps them from racing a stop of the same stream
+        for stream_id in stream_ids:
+            stream_instance = self.active_streams.get(stream_id)
+            if stream_instance is None:
+                continue
+            if stream_id in self._in_flight or stream_instance.status in self._TRANSITIONAL:
+                # Recovery or a (re)start is running; hold on to its exits for the next pass
+                self._defer_exits(stream_id, stream_instance, exited)
+                continue
+            if stream_instance.status != "live":
+                continue
+            
+            with stream_instance.lifecycle_lock:
+                if self.active_streams.get(stream_id) is not stream_instance:
+                    continue  # Stopped or replaced while we waited
+                if stream_instance.status != "live":
+                    if stream_instance.status in self._TRANSITIONAL:
+                        self._defer_exits(stream_id, stream_instance, exited)
+                    continue
+                
+                # Ignore exits of processes we replaced or stopped on purpose
+                dead_processes = [
+                    name for name, proc in exited.get(stream_id, ())
+                    if stream_instance.processes.get(name) is proc
+                ]
+                
+                if dead_processes:
+                    self._dispatch_recovery(stream_id, stream_instance, self._handle_dead_stream, dead_processes)
+                elif collect_metrics and (
+                    stream_instance._metrics_dirty
+                    # A stalled FFmpeg stops reporting, so its snapshot never changes; score it anyway
+                    or time.monotonic() - stream_instance._progress_time >= progress_stale
+                    or current_time - stream_instance._last_collected >= metrics_heartbeat
+                ):
+                    stream_instance._metrics_dirty = False
+                    stream_instance._last_collected = current_time
+                    self._collect_stream_metrics(stream_id, stream_instance)
+    
+    def _defer_exits(self, stream_id, stream_instance, exited):
+        """Re-queue exits of a busy stream's current processes; they were already popped from
+        _pid_index, so nothing else would ever report them again"""
+        for name, proc in exited.get(stream_id, ()):
+            if stream_instance.processes.get(name) is proc:
+                self._exited.append((stream_id, name, proc))
+    
+    def _dispatch_recovery(self, stream_id, stream_instance, handler, *args):
+        """Run handler(stream_id, stream_instance, *args) on the recovery pool"""
+        future = self._recovery_pool.submit(self._run_recovery, stream_id, stream_instance, handler, *args)
+        self._in_flight[stream_id] = future
+        future.add_done_callback(lambda f: self._recovery_done(stream_id, f))
+    
+    def _run_recovery(self, stream_id, stream_instance, handler, *args):
+        """Recovery pool task: run handler under the stream's lifecycle lock"""
+        with stream_instance.lifecycle_lock:
+            if self.active_streams.get(stream_id) is not stream_instance:
+                return  # Stopped or replaced before we got to it
+            handler(stream_id, stream_instance, *args)
+    
+    def _recovery_done(self, stream_id, future):
+        """Clear the in-flight marker and wake the monitor to flush writes and re-check"""
+        self._in_flight.pop(stream_id, None)
+        if not future.cancelled() and future.exception():
+            logger.error(f"Recovery task for {stream_id} failed: {future.exception()}")
+        self._wake_monitor()
+    
+    def _preemptive_recovery(self, stream_id, stream_instance, failure_types):
+        """Recover a live stream whose health is degrading"""
+        logger.info(f"Starting preemptive recovery for {stream_id}")
+        recovery_success, recovery_message = stream_instance.attempt_recovery(failure_types)
+        
+        if recovery_success:
+            self._pending_writes.append((
+                'create_alert',
+                stream_id,
+                'preemptive_recovery',
+                'info',
+                f'Preemptive recovery successful: {recovery_message}'
+            ))
+            return
+        
+        logger.error(f"Preemptive recovery failed for stream {stream_id}: {recovery_message}")
+        self._fail_stream(stream_id, stream_instance, {
+            'reason': 'preemptive_recovery_failed',
+            'failure_types': failure_types,
+            'recovery_message': recovery_message
+        })
+    
+    def _handle_dead_stream(self, stream_id, stream_instance, dead_processes):
+        """Run intelligent recovery for a stream whose processes died"""
+        for process_name in dead_processes:
+            logger.warning(f"Process {process_name} died for stream {stream_id}")
+        logger.error(f"Stream {stream_id} failed, attempting intelligent recovery")
+        
+        # Detect failure types for intelligent recovery
+        failure_types = stream_instance.detect_failure_type()
+        
+        # Attempt intelligent recovery
+        recovery_success, recovery_message = stream_instance.attempt_recovery(failure_types)
+        
+        if recovery_success:
+            logger.info(f"Successfully recovered stream {stream_id}: {recovery_message}")
+            return
+        
+        logger.error(f"Recovery failed for stream {stream_id}: {recovery_message}")
+        self._fail_stream(stream_id, stream_instance, {
+            'reason': 'auto_recovery_failed',
+            'dead_processes': dead_processes,
+            'failure_types': failure_types,
+            'recovery_message': recovery_message
+        })
+    
+    def _fail_stream(self, stream_id, stream_instance, details):
+        """Give up on a stream whose recovery failed: stop its processes and mark it 'error'"""
+        stream_instance.cleanup()
+        stream_instance.status = "error"
+        # Queued with the rest of the monitor's writes: one transaction however many streams failed
+        self._pending_writes.append(('update_stream_status', stream_id, 'error'))
+        self._pending_writes.append(('log_event', stream_id, 'recovery_failed', details))
+    
+    def _collect_stream_metrics(self, stream_id, stream_instance):
+        """Collect performance metrics and health scoring for a healthy stream"""
+        try:
+            metrics = stream_instance.collect_metrics()
+            if metrics:
+                self._pending_writes.append(('log_metrics', stream_id, metrics))
+                
+                # Calculate and track health score
+                health_score = stream_instance.calculate_health_score()
+                
+                # Check for performance issues
+                self._check_performance_alerts(stream_id, metrics)
+                
+                # Predictive recovery for degrading health
+                if health_score < 50 and not stream_instance.recovery_in_progress:
+                    logger.warning(f"Stream {stream_id} health degrading: {health_score:.1f}%")
+                    
+                    # Attempt preemptive recovery
+                    failure_types = stream_instance.detect_failure_type()
+                    if failure_types and 'unknown_failure' not in failure_types:
+                        self._dispatch_recovery(stream_id, stream_instance, self._preemptive_recovery, failure_types)
+                
+        except Exception as e:
+            logger.error(f"Error collecting metrics for {stream_id}: {e}")
     
     def _check_performance_alerts(self, stream_id, metrics):
         """Check metrics for performance issues and create alerts"""
         try:
-            # Check CPU usage
-            if metrics.get('cpu_usage', 0) > 80:
-                self.db.create_alert(
-                    stream_id, 
-                    'high_cpu', 
-                    'warning', 
-                    f'High CPU usage: {metrics["cpu_usage"]:.1f}%'
-                )
-            
-            # Check memory usage
-            if metrics.get('memory_usage', 0) > 1000:  # > 1GB
-                self.db.create_alert(
-                    stream_id, 
-                    'high_memory', 
-                    'warning', 
-                    f'High memory usage: {metrics["memory_usage"]:.0f}MB'
-                )
+            cpu_usage = metrics.get('cpu_usage', 0)
+            memory_usage = metrics.get('memory_usage', 0)
+            frame_drops = metrics.get('frame_drops', 0)
             
-            # Check frame drops
-            if metrics.get('frame_drops', 0) > 100:
-                self.db.create_alert(
-                    stream_id, 
-                    'frame_drops', 
-                    'warning', 
-                    f'Frame drops detected: {metrics["frame_drops"]} frames'
-                )
+            alerts = []
+            if cpu_usage > 80:
+                alerts.append(('high_cpu', f'High CPU usage: {cpu_usage:.1f}%'))
+            if memory_usage > 1000:  # > 1GB
+                alerts.append(('high_memory', f'High memory usage: {memory_usage:.0f}MB'))
+            if frame_drops > 100:
+                alerts.append(('frame_drops', f'Frame drops detected: {frame_drops} frames'))
+            
+            # Queued together; _flush_pending_writes inserts them in one transaction
+            self._pending_writes.extend(
+                ('create_alert', stream_id, alert_type, 'warning', message) for alert_type, message in alerts
+            )
                 
         except Exception as e:
             logger.error(f"Error checking performance alerts: {e}")
     
+    def _flush_pending_writes(self):
+        """Commit everything the monitor queued this cycle in one transaction"""
+        if not self._pending_writes:
+            return
+        
+        ops = []
+        while self._pending_writes:
+            ops.append(self._pending_writes.popleft())
+        
+        try:
+            self.db.apply_batch(ops)
+        except Exception as e:
+            logger.error(f"Error flushing {len(ops)} monitor writes: {e}")
+    
     def create_stream(self, stream_data):
         """Create a new stream"""
         try:
@@ -2016,52 +2739,92 @@ class StreamManager:
             return False, None, f"Error creating stream: {e}"
     
     def start_stream(self, stream_id):
-        """Start a specific stream"""
+        """Queue a stream start; its status goes starting -> live (or error) as the start pool runs it"""
         try:
             with stream_lock:
-                if stream_id in self.active_streams:
-                    return self.active_streams[stream_id].start_streaming()
-                
-                # Load stream config and create instance
-                stream_config = self.db.get_stream(stream_id)
-                if not stream_config:
-                    return False, "Stream not found"
-                
-                stream_instance = StreamInstance(stream_config, self.db)
-                self.active_streams[stream_id] = stream_instance
+                stream_instance = self.active_streams.get(stream_id)
+                if stream_instance is not None:
+                    if stream_instance.status not in ('stopped', 'error'):
+                        return False, f"Stream is already {stream_instance.status}"
+                else:
+                    # Load stream config and create instance
+                    stream_config = self.db.get_stream(stream_id)
+                    if not stream_config:
+                        return False, "Stream not found"
+                    
+                    stream_instance = StreamInstance(stream_config, self.db)
+                    stream_instance.process_watcher = self._watch_process
+                    self.active_streams = {**self.active_streams, stream_id: stream_instance}
+                    self._rebalance_threads()
                 
-                return stream_instance.start_streaming()
+                # Recorded before submitting, so a fast start's 'live' can't be overwritten
+                stream_instance.status = "starting"
+                self.db.update_stream_status(stream_id, 'starting')
+                self._start_pool.submit(self._start_instance, stream_id, stream_instance)
+                return True, "Stream starting"
                 
         except Exception as e:
             logger.error(f"Error starting stream {stream_id}: {e}")
             return False, f"Error starting stream: {e}"
     
+    def _start_instance(self, stream_id, stream_instance):
+        """Start pool task: spawn a stream's processes, dropping the stream again if that fails"""
+        try:
+            with stream_instance.lifecycle_lock:
+                if self.active_streams.get(stream_id) is not stream_instance:
+                    return  # Stopped before its turn came
+                success, message = stream_instance.start_streaming()
+        except Exception as e:
+            success, message = False, f"Error starting stream: {e}"
+        if success:
+            return
+        
+        logger.error(f"Failed to start stream {stream_id}: {message}")
+        with stream_lock:
+            if self.active_streams.get(stream_id) is stream_instance:
+                active_streams = dict(self.active_streams)
+                del active_streams[stream_id]
+                self.active_streams = active_streams
+                self._rebalance_threads()
+        stream_instance.status = "error"
+        self.db.update_stream_status(stream_id, 'error')
+        self.db.log_event(stream_id, 'stream_start_failed', {'message': message})
+    
     def stop_stream(self, stream_id):
         """Stop a specific stream"""
         try:
             with stream_lock:
-                if stream_id not in self.active_streams:
-                    # Stream not in active_streams - check if it needs to be reset
-                    stream_config = self.db.get_stream(stream_id)
-                    if stream_config and stream_config['status'] != 'stopped':
-                        # Reset the stream status to stopped in database
-                        self.db.update_stream_status(stream_id, 'stopped')
-                        self.db.log_event(stream_id, 'stream_reset', {
-                            'reason': 'manual_reset_from_error_state',
-                            'previous_status': stream_config['status']
-                        })
-                        logger.info(f"Reset stream {stream_id} from {stream_config['status']} to stopped")
-                        return True, "Stream reset to stopped state"
-                    return False, "Stream not active"
-                
-                result = self.active_streams[stream_id].stop_streaming()
-                del self.active_streams[stream_id]
-                return result
+                return self._stop_stream_locked(stream_id)
                 
         except Exception as e:
             logger.error(f"Error stopping stream {stream_id}: {e}")
             return False, f"Error stopping stream: {e}"
     
+    def _stop_stream_locked(self, stream_id):
+        """Stop a stream and drop it from active_streams (caller holds stream_lock)"""
+        if stream_id not in self.active_streams:
+            # Stream not in active_streams - check if it needs to be reset
+            stream_config = self.db.get_stream(stream_id)
+            if stream_config and stream_config['status'] != 'stopped':
+                # Reset the stream status to stopped in database
+                self.db.update_stream_status(stream_id, 'stopped')
+                self.db.log_event(stream_id, 'stream_reset', {
+                    'reason': 'manual_reset_from_error_state',
+                    'previous_status': stream_config['status']
+                })
+                logger.info(f"Reset stream {stream_id} from {stream_config['status']} to stopped")
+                return True, "Stream reset to stopped state"
+            return False, "Stream not active"
+        
+        stream_instance = self.active_streams[stream_id]
+        with stream_instance.lifecycle_lock:
+            result = stream_instance.stop_streaming()
+        active_streams = dict(self.active_streams)
+        del active_streams[stream_id]
+        self.active_streams = active_streams
+        self._rebalance_threads()
+        return result
+    
     def update_stream(self, stream_id, stream_data):
         """Update a stream configuration"""
         try:
@@ -2071,23 +2834,17 @@ class StreamManager:
                 if not existing_stream:
                     return False, "Stream not found"
                 
-                # Stop stream if running (will need restart for changes)
-                was_running = False
-                if stream_id in self.active_streams:
-                    was_running = True
-                    self.stop_stream(stream_id)
-                
                 # Update stream in database
                 success = self.db.update_stream(stream_id, stream_data)
                 if not success:
                     return False, "Failed to update stream"
                 
-                # Restart stream if it was running
-                if was_running:
-                    # Give it a moment, then restart
-                    import time
-                    time.sleep(1)
-                    self.start_stream(stream_id)
+                # A running stream restarts only what the change affects (if anything), off the request thread
+                stream_instance = self.active_streams.get(stream_id)
+                if stream_instance is not None:
+                    changes = {field: stream_data[field] for field in self.db.STREAM_UPDATE_FIELDS if field in stream_data}
+                    self._restart_pool.submit(self._apply_update, stream_id, stream_instance, changes)
+                    return True, "Stream updated; changes are being applied to the running stream"
                 
                 return True, "Stream updated successfully"
                 
@@ -2095,13 +2852,24 @@ class StreamManager:
             logger.error(f"Error updating stream {stream_id}: {e}")
             return False, f"Error updating stream: {e}"
     
+    def _apply_update(self, stream_id, stream_instance, changes):
+        """Restart pool task: apply saved config changes to a running stream"""
+        try:
+            with stream_instance.lifecycle_lock:
+                if self.active_streams.get(stream_id) is not stream_instance:
+                    return  # Stopped or replaced; the next start reads the saved config
+                if not stream_instance.reconfigure(changes):
+                    logger.error(f"Stream {stream_id} updated but failed to apply changes to the running stream")
+        except Exception as e:
+            logger.error(f"Error applying update to stream {stream_id}: {e}")
+    
     def delete_stream(self, stream_id):
         """Delete a stream configuration"""
         try:
             with stream_lock:
-                # Stop stream if running
+                # Stop stream if running (stream_lock isn't reentrant, so not via stop_stream)
                 if stream_id in self.active_streams:
-                    self.stop_stream(stream_id)
+                    self._stop_stream_locked(stream_id)
                 
                 self.db.delete_stream(stream_id)
                 return True, "Stream deleted successfully"
@@ -2110,58 +2878,263 @@ class StreamManager:
             logger.error(f"Error deleting stream {stream_id}: {e}")
             return False, f"Error deleting stream: {e}"
     
-    def get_all_streams(self):
-        """Get all streams with current status"""
-        streams = self.db.get_all_streams()
-        
-        # Update with live status and uptime
-        for stream in streams:
-            stream_id = stream['id']
-            if stream_id in self.active_streams:
-                stream_instance = self.active_streams[stream_id]
-                stream['status'] = stream_instance.status
-                stream['uptime'] = stream_instance.get_uptime()
-            else:
-                stream['uptime'] = "0m"
+    def get_targets(self, stream_id):
+        """Multi-stream targets for a stream (the live instance's parsed list when active)"""
+        stream_instance = self.active_streams.get(stream_id)
+        if stream_instance is not None:
+            return stream_instance.multi_stream_targets
         
-        return streams
+        stream = self.db.get_stream(stream_id)
+        if not stream:
+            return None
+        return _parse_json_field(stream.get('multi_stream_targets'), [])
+    
+    def add_target(self, stream_id, target):
+        """Append a multi-stream target in the DB and refresh the live instance"""
+        return self._refresh_targets(stream_id, self.db.append_multi_stream_target(stream_id, target))
+    
+    def remove_target(self, stream_id, index):
+        """Remove a multi-stream target in the DB and refresh the live instance"""
+        return self._refresh_targets(stream_id, self.db.remove_multi_stream_target(stream_id, index))
+    
+    def _refresh_targets(self, stream_id, targets_json):
+        """Hand the live instance the new targets JSON; it re-parses lazily on next use"""
+        if targets_json is None:
+            return False
+        stream_instance = self.active_streams.get(stream_id)
+        if stream_instance is not None:
+            stream_instance.config['multi_stream_targets'] = targets_json
+            stream_instance.multi_stream_targets = None
+        return True
+    
+    def set_audio(self, stream_id, audio_config):
+        """Persist audio configuration and refresh the live instance's copy"""
+        success = self.db.update_stream(stream_id, {'audio_config': audio_config})
+        stream_instance = self.active_streams.get(stream_id)
+        if success and stream_instance is not None:
+            stream_instance.audio_config = audio_config
+        return success
+    
+    def active_snapshot(self):
+        """Snapshot {stream_id: (status, uptime)} of active streams (lock-free)"""
+        now = time.time()
+        return {
+            stream_id: (stream_instance.status, stream_instance.get_uptime(now))
+            for stream_id, stream_instance in self.active_streams.items()
+        }
+    
+    def get_all_streams(self, snapshot=None):
+        """Get all streams with current status"""
+        if snapshot is None:
+            snapshot = self.active_snapshot()
+        return self.db.get_all_streams_with_overrides(snapshot)
     
     def cleanup_all(self):
         """Clean up all active streams"""
-        with stream_lock:
-            for stream_instance in self.active_streams.values():
-                stream_instance.cleanup()
-            self.active_streams.clear()
+        with stream_lock, ExitStack() as held:
+            instances = list(self.active_streams.values())
+            for stream_instance in instances:
+                held.enter_context(stream_instance.lifecycle_lock)
+            
+            # Signal every stream's children up front, then reap them all against one deadline
+            running = [stream_instance._signal_children() for stream_instance in instances]
+            deadline = time.monotonic() + 5
+            for stream_instance, processes in zip(instances, running):
+                stream_instance._reap_children(processes, deadline)
+            self.active_streams = {}
         
         self.stop_monitoring()
+        self._recovery_pool.shutdown(wait=False, cancel_futures=True)
+        self._start_pool.shutdown(wait=False, cancel_futures=True)
+        self._restart_pool.shutdown(wait=False, cancel_futures=True)
         logger.info("All streams cleaned up")
 
+# orjson options for every API response: numpy values (metrics) and non-str dict keys
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson: compact output, keys left unsorted"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=_ORJSON_OPTS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=_ORJSON_OPTS), mimetype='application/json')
+
 # Create Flask app
 app = Flask(__name__)
+# request.json and any jsonify() (including Flask's own) go through orjson too
+app.json = OrjsonProvider(app)
+
+def _load_secret_key(path='.streamdrop_secret'):
+    """FLASK_SECRET_KEY, else a random key generated once and kept on disk so sessions survive restarts"""
+    key = os.environ.get('FLASK_SECRET_KEY')
+    if key:
+        return key
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    key = os.urandom(24).hex()
+    with os.fdopen(fd, 'w') as f:
+        f.write(key)
+    return key
+
 # Set secret key for sessions (generate random key if not exists)
-app.secret_key = os.environ.get('FLASK_SECRET_KEY', os.urandom(24).hex())
+app.secret_key = _load_secret_key()
 stream_manager = StreamManager()
 
+def fast_jsonify(data, status=200):
+    """jsonify() with a status code, skipping jsonify's argument handling"""
+    return app.response_class(orjson.dumps(data, option=_ORJSON_OPTS), status=status, mimetype='application/json')
+
+def _json_array_response(rows, batch=500):
+    """Stream an iterable of rows as one JSON array, encoding a batch of rows per chunk"""
+    def generate():
+        yield b'['
+        separator = b''
+        for chunk in iter(lambda: list(itertools.islice(rows, batch)), []):
+            yield separator + b','.join(orjson.dumps(row, option=_ORJSON_OPTS) for row in chunk)
+            separator = b','
+        yield b']'
+    return app.response_class(generate(), mimetype='application/json')
+
+# Error bodies for the messages routes return most often, encoded once at import
+_CANNED_ERRORS = {
+    message: orjson.dumps({"success": False, "message": message})
+    for message in ("Stream not found", "Stream not active", "Template not found", "Platform not found",
+                    "Invalid target index", "Recovery already in progress")
+}
+
+def _err(message):
+    """{"success": false, "message": message} response, pre-encoded for the common messages"""
+    body = _CANNED_ERRORS.get(message)
+    if body is None:
+        body = orjson.dumps({"success": False, "message": message})
+    return app.response_class(body, mimetype='application/json')
+
+# Encoded GET /api/platforms body; platform configs only change through the platform write routes
+_PLATFORMS_BODY = None
+
+def _platforms_body():
+    """Return the cached platforms JSON, querying and encoding it only after a change"""
+    global _PLATFORMS_BODY
+    if _PLATFORMS_BODY is None:
+        _PLATFORMS_BODY = orjson.dumps(stream_manager.db.get_platform_configs(), option=_ORJSON_OPTS)
+    return _PLATFORMS_BODY
+
+def _platforms_changed():
+    """Drop every cached copy of the platform configs after a write"""
+    global _PLATFORMS_BODY
+    _PLATFORMS_BODY = None
+    StreamInstance.invalidate_platform_configs()
+
+# Parsed .streamdrop_auth as (username_bytes, password_bytes), reloaded when its mtime changes
+_AUTH = None
+_AUTH_MTIME = 0
+
+def _load_auth():
+    """Return cached credentials, re-reading the auth file only if it changed"""
+    global _AUTH, _AUTH_MTIME
+    try:
+        mtime = os.stat('.streamdrop_auth').st_mtime_ns
+    except FileNotFoundError:
+        _AUTH, _AUTH_MTIME = None, 0
+        return None
+    
+    if _AUTH is None or mtime != _AUTH_MTIME:
+        with open('.streamdrop_auth', 'r') as f:
+            stored_username, stored_password = f.read().strip().split(':', 1)
+        _AUTH = (stored_username.encode(), stored_password.encode())
+        _AUTH_MTIME = mtime
+    return _AUTH
+
 def check_auth(username, password):
     """Check if username and password match stored credentials"""
-    # Add 1-second delay to prevent timing attacks and PRNG exploitation
-    time.sleep(1)
-    
     try:
-        if os.path.exists('.streamdrop_auth'):
-            with open('.streamdrop_auth', 'r') as f:
-                stored_auth = f.read().strip()
-                stored_username, stored_password = stored_auth.split(':', 1)
-                return username == stored_username and password == stored_password
+        auth = _load_auth()
+        if auth:
+            stored_username, stored_password = auth
+            # Constant-time compares, and no short-circuit so both always run
+            return hmac.compare_digest(username.encode(), stored_username) & \
+                hmac.compare_digest(password.encode(), stored_password)
     except Exception as e:
         logger.error(f"Error checking authentication: {e}")
     return False
 
+# Failed logins per client address, as a sliding window of timestamps
+LOGIN_MAX_FAILURES = 5
+LOGIN_WINDOW_SECONDS = 60
+LOGIN_MAX_CLIENTS = 10000  # Tracked addresses, so a scan from many IPs can't grow this unbounded
+_login_failures = defaultdict(deque)
+_login_failures_lock = Lock()
+_login_pruned_at = 0
+
+def _login_allowed(client, now):
+    """True unless the client has LOGIN_MAX_FAILURES failed logins inside the window"""
+    with _login_failures_lock:
+        failures = _login_failures.get(client)
+        if failures is None:
+            return True
+        while failures and now - failures[0] > LOGIN_WINDOW_SECONDS:
+            failures.popleft()
+        if not failures:
+            del _login_failures[client]
+            return True
+        return len(failures) < LOGIN_MAX_FAILURES
+
+def _record_login(client, now, success):
+    """Forget a client's failures on success, remember this one otherwise"""
+    global _login_pruned_at
+    with _login_failures_lock:
+        if success:
+            _login_failures.pop(client, None)
+            return
+        
+        # Once per window, forget clients whose latest failure has expired
+        if now - _login_pruned_at > LOGIN_WINDOW_SECONDS:
+            _login_pruned_at = now
+            for stale in [c for c, f in _login_failures.items() if now - f[-1] > LOGIN_WINDOW_SECONDS]:
+                del _login_failures[stale]
+        # Still too many live entries: drop the longest-tracked (dicts keep insertion order)
+        if client not in _login_failures and len(_login_failures) >= LOGIN_MAX_CLIENTS:
+            del _login_failures[next(iter(_login_failures))]
+        _login_failures[client].append(now)
+
+# Login cookie "<username>.<expiry>.<hex HMAC-SHA256>" keyed by the app secret: checking it
+# is one HMAC over a few dozen bytes, with no session (itsdangerous) decode per API call
+AUTH_COOKIE = 'streamdrop_auth'
+AUTH_COOKIE_TTL = 7 * 24 * 3600
+
+def _sign_auth(payload):
+    """Hex HMAC-SHA256 of an auth cookie payload"""
+    return hmac.digest(app.secret_key.encode(), payload.encode(), 'sha256').hex()
+
+def _set_auth_cookie(response, username):
+    """Attach a freshly signed login cookie to response"""
+    payload = f"{username}.{int(time.time()) + AUTH_COOKIE_TTL}"
+    response.set_cookie(AUTH_COOKIE, f"{payload}.{_sign_auth(payload)}", httponly=True, samesite='Lax')
+    return response
+
+def _auth_cookie_valid(value):
+    """True if the login cookie carries a valid signature and hasn't expired"""
+    payload, _, signature = value.rpartition('.')
+    if not payload or not hmac.compare_digest(_sign_auth(payload), signature):
+        return False
+    expiry = payload.rpartition('.')[2]
+    return expiry.isdigit() and int(expiry) > time.time()
+
 def requires_auth(f):
-    """Decorator to require login via session"""
+    """Decorator to require login via the signed auth cookie"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        if not session.get('logged_in'):
+        cookie = request.cookies.get(AUTH_COOKIE)
+        if not cookie or not _auth_cookie_valid(cookie):
             return redirect(url_for('login'))
         return f(*args, **kwargs)
     return decorated
@@ -2172,13 +3145,18 @@ def login():
     error = None
     
     if request.method == 'POST':
+        client = request.remote_addr
+        now = time.monotonic()
+        if not _login_allowed(client, now):
+            return render_template('login.html', error='Too many failed attempts, try again in a minute'), 429
+        
         username = request.form['username']
         password = request.form['password']
         
-        if check_auth(username, password):
-            session['logged_in'] = True
-            session['username'] = username
-            return redirect(url_for('dashboard'))
+        success = check_auth(username, password)
+        _record_login(client, now, success)
+        if success:
+            return _set_auth_cookie(redirect(url_for('dashboard')), username)
         else:
             error = 'Invalid username or password'
     
@@ -2189,7 +3167,9 @@ def logout():
     """Logout and clear session"""
     session.clear()
     flash('Successfully logged out!', 'info')
-    return redirect(url_for('login'))
+    response = redirect(url_for('login'))
+    response.delete_cookie(AUTH_COOKIE)
+    return response
 
 @app.route('/')
 @requires_auth
@@ -2207,8 +3187,17 @@ def analytics():
 @requires_auth
 def api_get_streams():
     """Get all streams"""
-    streams = stream_manager.get_all_streams()
-    return jsonify(streams)
+    # Unchanged DB rows + unchanged live status/uptime -> 304 without touching the DB
+    snapshot = stream_manager.active_snapshot()
+    etag = f"{stream_manager.db.streams_version}-{hash(frozenset(snapshot.items())) & 0xffffffff:x}"
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    response = fast_jsonify(stream_manager.get_all_streams(snapshot))
+    response.set_etag(etag)
+    return response
 
 @app.route('/api/streams', methods=['POST'])
 @requires_auth
@@ -2217,16 +3206,16 @@ def api_create_stream():
     try:
         stream_data = request.json
         success, stream_id, message = stream_manager.create_stream(stream_data)
-        return jsonify({"success": success, "stream_id": stream_id, "message": message})
+        return fast_jsonify({"success": success, "stream_id": stream_id, "message": message})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 # Project Management APIs
 @app.route('/api/projects', methods=['GET'])
 def api_get_projects():
     """Get all projects"""
     projects = stream_manager.db.get_all_projects()
-    return jsonify(projects)
+    return fast_jsonify(projects)
 
 @app.route('/api/projects', methods=['POST'])
 def api_create_project():
@@ -2234,9 +3223,9 @@ def api_create_project():
     try:
         project_data = request.json
         project_id = stream_manager.db.create_project(project_data)
-        return jsonify({"success": True, "project_id": project_id, "message": "Project created successfully"})
+        return fast_jsonify({"success": True, "project_id": project_id, "message": "Project created successfully"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/projects/<project_id>', methods=['PUT'])
 def api_update_project(project_id):
@@ -2244,25 +3233,25 @@ def api_update_project(project_id):
     try:
         project_data = request.json
         success = stream_manager.db.update_project(project_id, project_data)
-        return jsonify({"success": success, "message": "Project updated successfully" if success else "Project not found"})
+        return fast_jsonify({"success": success, "message": "Project updated successfully" if success else "Project not found"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/projects/<project_id>', methods=['DELETE'])
 def api_delete_project(project_id):
     """Delete project"""
     try:
         stream_manager.db.delete_project(project_id)
-        return jsonify({"success": True, "message": "Project deleted successfully"})
+        return fast_jsonify({"success": True, "message": "Project deleted successfully"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 # Template Management APIs
 @app.route('/api/templates', methods=['GET'])
 def api_get_templates():
     """Get all stream templates"""
     templates = stream_manager.db.get_all_templates()
-    return jsonify(templates)
+    return fast_jsonify(templates)
 
 @app.route('/api/templates', methods=['POST'])
 def api_create_template():
@@ -2270,9 +3259,9 @@ def api_create_template():
     try:
         template_data = request.json
         template_id = stream_manager.db.create_template(template_data)
-        return jsonify({"success": True, "template_id": template_id, "message": "Template created successfully"})
+        return fast_jsonify({"success": True, "template_id": template_id, "message": "Template created successfully"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/templates/<template_id>', methods=['GET'])
 def api_get_template(template_id):
@@ -2280,11 +3269,11 @@ def api_get_template(template_id):
     try:
         template = stream_manager.db.get_template(template_id)
         if template:
-            return jsonify(template)
+            return fast_jsonify(template)
         else:
-            return jsonify({"success": False, "message": "Template not found"})
+            return _err("Template not found")
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/templates/<template_id>', methods=['PUT'])
 def api_update_template(template_id):
@@ -2292,18 +3281,18 @@ def api_update_template(template_id):
     try:
         template_data = request.json
         success = stream_manager.db.update_template(template_id, template_data)
-        return jsonify({"success": success, "message": "Template updated successfully" if success else "Template not found"})
+        return fast_jsonify({"success": success, "message": "Template updated successfully" if success else "Template not found"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/templates/<template_id>', methods=['DELETE'])
 def api_delete_template(template_id):
     """Delete template"""
     try:
         success = stream_manager.db.delete_template(template_id)
-        return jsonify({"success": success, "message": "Template deleted successfully" if success else "Template not found"})
+        return fast_jsonify({"success": success, "message": "Template deleted successfully" if success else "Template not found"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/streams/from-template', methods=['POST'])
 def api_create_stream_from_template():
@@ -2315,23 +3304,33 @@ def api_create_stream_from_template():
         
         stream_id = stream_manager.db.create_stream_from_template(template_id, stream_data)
         if stream_id:
-            return jsonify({"success": True, "stream_id": stream_id, "message": "Stream created from template"})
+            return fast_jsonify({"success": True, "stream_id": stream_id, "message": "Stream created from template"})
         else:
-            return jsonify({"success": False, "message": "Failed to create stream from template"})
+            return _err("Failed to create stream from template")
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 # Platform Management APIs
 
+@app.route('/api/platforms', methods=['GET'])
+@requires_auth
+def api_get_platforms():
+    """Get all available streaming platforms"""
+    try:
+        return app.response_class(_platforms_body(), mimetype='application/json')
+    except Exception as e:
+        return fast_jsonify({"error": f"Error retrieving platforms: {e}"})
+
 @app.route('/api/platforms', methods=['POST'])
 def api_create_platform():
     """Create new platform configuration"""
     try:
         platform_data = request.json
         platform_id = stream_manager.db.create_platform_config(platform_data)
-        return jsonify({"success": True, "platform_id": platform_id, "message": "Platform configuration created"})
+        _platforms_changed()
+        return fast_jsonify({"success": True, "platform_id": platform_id, "message": "Platform configuration created"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/platforms/<platform_name>', methods=['GET'])
 def api_get_platform(platform_name):
@@ -2339,11 +3338,11 @@ def api_get_platform(platform_name):
     try:
         platform = stream_manager.db.get_platform_config(platform_name)
         if platform:
-            return jsonify(platform)
+            return fast_jsonify(platform)
         else:
-            return jsonify({"success": False, "message": "Platform not found"})
+            return _err("Platform not found")
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/platforms/<platform_name>', methods=['PUT'])
 def api_update_platform(platform_name):
@@ -2351,18 +3350,20 @@ def api_update_platform(platform_name):
     try:
         platform_data = request.json
         success = stream_manager.db.update_platform_config(platform_name, platform_data)
-        return jsonify({"success": success, "message": "Platform updated successfully" if success else "Platform not found"})
+        _platforms_changed()
+        return fast_jsonify({"success": success, "message": "Platform updated successfully" if success else "Platform not found"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/platforms/<platform_name>', methods=['DELETE'])
 def api_delete_platform(platform_name):
     """Delete platform configuration"""
     try:
         success = stream_manager.db.delete_platform_config(platform_name)
-        return jsonify({"success": success, "message": "Platform deleted successfully" if success else "Platform not found"})
+        _platforms_changed()
+        return fast_jsonify({"success": success, "message": "Platform deleted successfully" if success else "Platform not found"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 # Multi-Stream Management APIs
 @app.route('/api/streams/<stream_id>/multi-targets', methods=['POST'])
@@ -2372,79 +3373,42 @@ def api_add_multi_stream_target(stream_id):
     try:
         target_data = request.json
         
-        # Get current stream
-        stream = stream_manager.db.get_stream(stream_id)
-        if not stream:
-            return jsonify({"success": False, "message": "Stream not found"})
-        
-        # Add new target
-        current_targets = stream.get('multi_stream_targets', [])
-        if isinstance(current_targets, str):
-            try:
-                current_targets = json.loads(current_targets)
-            except:
-                current_targets = []
-        
-        current_targets.append(target_data)
-        
-        # Update stream
-        success = stream_manager.db.update_stream(stream_id, {
-            'multi_stream_targets': json.dumps(current_targets)
-        })
+        # Append in place with JSON1; no read-modify-write, so concurrent adds can't lose each other
+        if not stream_manager.add_target(stream_id, target_data):
+            return _err("Stream not found")
         
-        return jsonify({"success": success, "message": "Multi-stream target added" if success else "Failed to add target"})
+        return fast_jsonify({"success": True, "message": "Multi-stream target added"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/streams/<stream_id>/multi-targets', methods=['GET'])
 @requires_auth
 def api_get_multi_stream_targets(stream_id):
     """Get multi-stream targets for a stream"""
     try:
-        stream = stream_manager.db.get_stream(stream_id)
-        if not stream:
-            return jsonify({"success": False, "message": "Stream not found"})
-        
-        targets = stream.get('multi_stream_targets', [])
-        if isinstance(targets, str):
-            try:
-                targets = json.loads(targets)
-            except:
-                targets = []
+        targets = stream_manager.get_targets(stream_id)
+        if targets is None:
+            return _err("Stream not found")
         
-        return jsonify(targets)
+        return fast_jsonify(targets)
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/streams/<stream_id>/multi-targets/<int:target_index>', methods=['DELETE'])
 @requires_auth
 def api_remove_multi_stream_target(stream_id, target_index):
     """Remove multi-stream target from a stream"""
     try:
-        stream = stream_manager.db.get_stream(stream_id)
-        if not stream:
-            return jsonify({"success": False, "message": "Stream not found"})
-        
-        targets = stream.get('multi_stream_targets', [])
-        if isinstance(targets, str):
-            try:
-                targets = json.loads(targets)
-            except:
-                targets = []
-        
-        if target_index < 0 or target_index >= len(targets):
-            return jsonify({"success": False, "message": "Invalid target index"})
+        if not stream_manager.db.get_stream(stream_id):
+            return _err("Stream not found")
         
-        targets.pop(target_index)
-        
-        # Update stream
-        success = stream_manager.db.update_stream(stream_id, {
-            'multi_stream_targets': json.dumps(targets)
-        })
+        # Bounds are checked inside the UPDATE, so a concurrent remove can't shift us out of range
+        if target_index < 0 or not stream_manager.remove_target(stream_id, target_index):
+            return _err("Invalid target index")
         
-        return jsonify({"success": success, "message": "Multi-stream target removed" if success else "Failed to remove target"})
+        return fast_jsonify({"success": True, "message": "Multi-stream target removed"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 # Audio Configuration APIs
 @app.route('/api/streams/<stream_id>/audio', methods=['PUT'])
@@ -2452,15 +3416,11 @@ def api_remove_multi_stream_target(stream_id, target_index):
 def api_update_stream_audio(stream_id):
     """Update stream audio configuration"""
     try:
-        audio_config = request.json
+        success = stream_manager.set_audio(stream_id, request.json)
         
-        success = stream_manager.db.update_stream(stream_id, {
-            'audio_input': json.dumps(audio_config)
-        })
-        
-        return jsonify({"success": success, "message": "Audio configuration updated" if success else "Failed to update audio"})
+        return fast_jsonify({"success": success, "message": "Audio configuration updated" if success else "Failed to update audio"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 # Project stream management
 @app.route('/api/projects/<project_id>/streams', methods=['GET'])
@@ -2469,23 +3429,23 @@ def api_get_project_streams(project_id):
     """Get all streams for a project"""
     try:
         streams = stream_manager.db.get_project_streams(project_id)
-        return jsonify(streams)
+        return fast_jsonify(streams)
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/streams/<stream_id>/start', methods=['POST'])
 @requires_auth
 def api_start_stream(stream_id):
     """Start specific stream"""
     success, message = stream_manager.start_stream(stream_id)
-    return jsonify({"success": success, "message": message})
+    return fast_jsonify({"success": success, "message": message})
 
 @app.route('/api/streams/<stream_id>/stop', methods=['POST'])
 @requires_auth
 def api_stop_stream(stream_id):
     """Stop specific stream"""
     success, message = stream_manager.stop_stream(stream_id)
-    return jsonify({"success": success, "message": message})
+    return fast_jsonify({"success": success, "message": message})
 
 @app.route('/api/streams/<stream_id>', methods=['PUT'])
 @requires_auth
@@ -2494,16 +3454,16 @@ def api_update_stream(stream_id):
     try:
         stream_data = request.json
         success, message = stream_manager.update_stream(stream_id, stream_data)
-        return jsonify({"success": success, "message": message})
+        return fast_jsonify({"success": success, "message": message})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/streams/<stream_id>', methods=['DELETE'])
 @requires_auth
 def api_delete_stream(stream_id):
     """Delete specific stream"""
     success, message = stream_manager.delete_stream(stream_id)
-    return jsonify({"success": success, "message": message})
+    return fast_jsonify({"success": success, "message": message})
 
 @app.route('/api/metrics/<stream_id>', methods=['GET'])
 @requires_auth
@@ -2511,10 +3471,21 @@ def api_get_stream_metrics(stream_id):
     """Get metrics for specific stream"""
     try:
         minutes = request.args.get('minutes', 30, type=int)
-        metrics = stream_manager.db.get_recent_metrics(stream_id, minutes)
-        return jsonify(metrics)
+        return _json_array_response(stream_manager.db.iter_recent_metrics(stream_id, minutes))
+    except Exception as e:
+        return fast_jsonify({"error": f"Error retrieving metrics: {e}"})
+
+@app.route('/api/metrics/<stream_id>/columnar', methods=['GET'])
+@requires_auth
+def api_get_stream_metrics_columnar(stream_id):
+    """Get metrics for specific stream as column arrays (for charts)"""
+    try:
+        minutes = request.args.get('minutes', 30, type=int)
+        columns = stream_manager.db.get_recent_metrics_columnar(stream_id, minutes)
+        return Response(orjson.dumps(columns, option=orjson.OPT_SERIALIZE_NUMPY),
+                        mimetype='application/json')
     except Exception as e:
-        return jsonify({"error": f"Error retrieving metrics: {e}"})
+        return fast_jsonify({"error": f"Error retrieving metrics: {e}"})
 
 @app.route('/api/alerts', methods=['GET'])
 @requires_auth
@@ -2522,10 +3493,9 @@ def api_get_alerts():
     """Get all unacknowledged alerts"""
     try:
         stream_id = request.args.get('stream_id')
-        alerts = stream_manager.db.get_stream_alerts(stream_id, acknowledged=False)
-        return jsonify(alerts)
+        return _json_array_response(stream_manager.db.iter_stream_alerts(stream_id, acknowledged=False))
     except Exception as e:
-        return jsonify({"error": f"Error retrieving alerts: {e}"})
+        return fast_jsonify({"error": f"Error retrieving alerts: {e}"})
 
 @app.route('/api/alerts/<int:alert_id>/acknowledge', methods=['POST'])
 @requires_auth
@@ -2533,50 +3503,44 @@ def api_acknowledge_alert(alert_id):
     """Acknowledge an alert"""
     try:
         # TODO: Implement alert acknowledgment
-        return jsonify({"success": True, "message": "Alert acknowledged"})
+        return fast_jsonify({"success": True, "message": "Alert acknowledged"})
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
+        return _err(f"Error: {e}")
 
 @app.route('/api/analytics/overview', methods=['GET'])
 @requires_auth
 def api_analytics_overview():
     """Get analytics overview for all streams"""
     try:
-        streams = stream_manager.get_all_streams()
-        total_streams = len(streams)
-        active_streams = len([s for s in streams if s['status'] == 'live'])
-        
-        # Calculate total uptime
-        total_uptime_seconds = sum(s.get('uptime_seconds', 0) for s in streams)
-        total_uptime_hours = total_uptime_seconds / 3600
-        
-        # Get recent alerts count
-        alerts = stream_manager.db.get_stream_alerts(acknowledged=False)
+        # Running streams report their live status; the DB's status counts for the rest
+        snapshot = stream_manager.active_snapshot()
+        totals = stream_manager.db.get_overview(snapshot)
+        active_streams = totals['live_streams'] + sum(status == 'live' for status, _ in snapshot.values())
         
         # Get recovery statistics
         recovery_stats = stream_manager.db.get_recovery_stats()
         
         overview = {
-            'total_streams': total_streams,
+            'total_streams': totals['total_streams'],
             'active_streams': active_streams,
-            'total_uptime_hours': round(total_uptime_hours, 1),
-            'active_alerts': len(alerts),
-            'system_status': 'operational' if len(alerts) == 0 else 'issues_detected',
+            'total_uptime_hours': round(totals['uptime_seconds'] / 3600, 1),
+            'active_alerts': totals['active_alerts'],
+            'system_status': 'operational' if totals['active_alerts'] == 0 else 'issues_detected',
             'recovery_stats': recovery_stats
         }
         
-        return jsonify(overview)
+        return fast_jsonify(overview)
     except Exception as e:
-        return jsonify({"error": f"Error retrieving overview: {e}"})
+        return fast_jsonify({"error": f"Error retrieving overview: {e}"})
 
 @app.route('/api/health/<stream_id>', methods=['GET'])
 def api_get_stream_health(stream_id):
     """Get health score for specific stream"""
     try:
         health = stream_manager.db.get_latest_health(stream_id)
-        return jsonify(health or {'health_score': 100, 'connection_quality': 100, 'performance_score': 100, 'stability_score': 100})
+        return fast_jsonify(health or {'health_score': 100, 'connection_quality': 100, 'performance_score': 100, 'stability_score': 100})
     except Exception as e:
-        return jsonify({"error": f"Error retrieving health: {e}"})
+        return fast_jsonify({"error": f"Error retrieving health: {e}"})
 
 @app.route('/api/recovery/<stream_id>', methods=['GET'])
 def api_get_stream_recovery(stream_id):
@@ -2585,26 +3549,25 @@ def api_get_stream_recovery(stream_id):
         recovery_stats = stream_manager.db.get_recovery_stats(stream_id)
         active_recovery = stream_manager.db.get_active_recovery(stream_id)
         
-        return jsonify({
+        return fast_jsonify({
             'stats': recovery_stats,
             'active_recovery': active_recovery
         })
     except Exception as e:
-        return jsonify({"error": f"Error retrieving recovery data: {e}"})
+        return fast_jsonify({"error": f"Error retrieving recovery data: {e}"})
 
 @app.route('/api/streams/<stream_id>/recover', methods=['POST'])
 @requires_auth
 def api_manual_recovery(stream_id):
     """Manually trigger recovery for a specific stream"""
     try:
-        with stream_lock:
-            if stream_id not in stream_manager.active_streams:
-                return jsonify({"success": False, "message": "Stream not active"})
-            
-            stream_instance = stream_manager.active_streams[stream_id]
-            
+        stream_instance = stream_manager.active_streams.get(stream_id)
+        if stream_instance is None:
+            return _err("Stream not active")
+        
+        with stream_instance.lifecycle_lock:
             if stream_instance.recovery_in_progress:
-                return jsonify({"success": False, "message": "Recovery already in progress"})
+                return _err("Recovery already in progress")
             
             # Detect current issues
             failure_types = stream_instance.detect_failure_type()
@@ -2615,23 +3578,13 @@ def api_manual_recovery(stream_id):
             # Attempt recovery
             success, message = stream_instance.attempt_recovery(failure_types)
             
-            return jsonify({
+            return fast_jsonify({
                 "success": success, 
                 "message": message,
                 "failure_types": failure_types
             })
     except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {e}"})
-
-@app.route('/api/platforms', methods=['GET'])
-@requires_auth
-def api_get_platforms():
-    """Get all available streaming platforms"""
-    try:
-        platforms = stream_manager.db.get_platform_configs()
-        return jsonify(platforms)
-    except Exception as e:
-        return jsonify({"error": f"Error retrieving platforms: {e}"})
+        return _err(f"Error: {e}")
 
 # Handle graceful shutdown
 def signal_handler(sig, frame):
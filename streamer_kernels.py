@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Streamer Kernels - per-pixel frame conversions for the headless streamers
+Uses the fastest backend available:
+- Numba: fused, parallel JIT kernel (optional)
+- OpenCV: SIMD cvtColor (optional)
+- NumPy: vectorised fallback
+"""
+
+import numpy as np
+
+try:
+    import numba  # Optional: JIT-compiled kernels
+except ImportError:
+    numba = None
+
+try:
+    import cv2  # Optional: SIMD colour conversion
+except ImportError:
+    cv2 = None
+
+prange = numba.prange if numba is not None else range
+
+def _i420_kernel(rgb, y_plane, u_plane, v_plane):
+    """BT.601 limited-range RGB -> I420 over 2x2 blocks in one pass (no temporaries)"""
+    height, width, _ = rgb.shape
+    for cy in prange(height // 2):
+        for cx in range(width // 2):
+            r_sum = g_sum = b_sum = 0
+            for dy in range(2):
+                for dx in range(2):
+                    y = 2 * cy + dy
+                    x = 2 * cx + dx
+                    r = np.int32(rgb[y, x, 0])
+                    g = np.int32(rgb[y, x, 1])
+                    b = np.int32(rgb[y, x, 2])
+                    y_plane[y, x] = ((66 * r + 129 * g + 25 * b + 128) >> 8) + 16
+                    r_sum += r
+                    g_sum += g
+                    b_sum += b
+            # Chroma from the average of the block
+            r = (r_sum + 2) >> 2
+            g = (g_sum + 2) >> 2
+            b = (b_sum + 2) >> 2
+            u_plane[cy, cx] = ((-38 * r - 74 * g + 112 * b + 128) >> 8) + 128
+            v_plane[cy, cx] = ((112 * r - 94 * g - 18 * b + 128) >> 8) + 128
+
+if numba is not None:
+    # nogil lets the writer thread run while a frame converts, like the cv2/NumPy paths
+    _i420_kernel = numba.njit(parallel=True, fastmath=True, cache=True, nogil=True)(_i420_kernel)
+
+def _i420_numpy(rgb, y_plane, u_plane, v_plane):
+    """Vectorised NumPy version of _i420_kernel"""
+    r, g, b = (rgb[..., c].astype(np.int32) for c in range(3))
+    y_plane[:] = ((66 * r + 129 * g + 25 * b + 128) >> 8) + 16
+
+    # Chroma from the average of each 2x2 block
+    r, g, b = (((p[0::2, 0::2] + p[1::2, 0::2] + p[0::2, 1::2] + p[1::2, 1::2]) + 2) >> 2 for p in (r, g, b))
+    u_plane[:] = ((-38 * r - 74 * g + 112 * b + 128) >> 8) + 128
+    v_plane[:] = ((112 * r - 94 * g - 18 * b + 128) >> 8) + 128
+
+def i420_planes(yuv, width, height):
+    """(Y, U, V) views into a flat I420 buffer"""
+    luma = width * height
+    return (yuv[:luma].reshape(height, width),
+            yuv[luma:luma * 5 // 4].reshape(height // 2, width // 2),
+            yuv[luma * 5 // 4:].reshape(height // 2, width // 2))
+
+def rgb_to_i420(rgb, yuv):
+    """Convert an (H, W, 3) RGB24 frame into a flat I420 (yuv420p) buffer, BT.601 limited range"""
+    height, width, _ = rgb.shape
+    if numba is not None:
+        _i420_kernel(rgb, *i420_planes(yuv, width, height))
+    elif cv2 is not None:
+        cv2.cvtColor(rgb, cv2.COLOR_RGB2YUV_I420, dst=yuv.reshape(height * 3 // 2, width))
+    else:
+        _i420_numpy(rgb, *i420_planes(yuv, width, height))
+    return yuv
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for StreamDrop
+Run with: gunicorn --workers 1 --threads 8 --bind 0.0.0.0:5000 wsgi:app
+"""
+
+from stream_manager import app, stream_manager
+
+# Active streams, their FFmpeg children and the monitor live in this process's memory,
+# so serve from ONE worker process and get request concurrency from its threads
+stream_manager.start_monitoring()